@@ -9,6 +9,7 @@ Source0:        centrio-%{version}.tar.xz
 Source1:        liveinst.desktop
 Source2:        centrio-live-sudoers
 Requires:       python3-gobject gtk4 libadwaita
+Recommends:     python3-orjson
 BuildRequires:  python3-devel
 
 %description
@@ -25,7 +25,7 @@ def _run_command(command_list, description, progress_callback=None, timeout=None
         execution_method = "directly as root"
         print(f"Executing Backend Step ({execution_method}): {description} -> {' '.join(shlex.quote(c) for c in final_command_list)}")
     else:
-        final_command_list = ["sudo"] + command_list
+        final_command_list = ["sudo", *command_list]
         execution_method = "via sudo"
         cmd_str = ' '.join(shlex.quote(c) for c in final_command_list)
         print(f"Executing Backend Step ({execution_method}): {description} -> {cmd_str}")
@@ -136,6 +136,20 @@ def ensure_directory(path, progress_callback=None):
     return ok
 
 
+def ensure_directories(paths, progress_callback=None):
+    """ensure_directory for several paths; when not root, one mkdir -p covers all of them."""
+    paths = list(paths)
+    if os.geteuid() == 0:
+        try:
+            for path in paths:
+                os.makedirs(path, exist_ok=True)
+            return True
+        except OSError:
+            return False
+    ok, _, _ = _run_command(["mkdir", "-p"] + paths, f"Create directories {' '.join(paths)}", progress_callback)
+    return ok
+
+
 def write_file_as_root(path, content, progress_callback=None):
     """Write content to path with elevated privileges. Use for target_root files when not root."""
     if os.geteuid() == 0:
@@ -1739,6 +1753,11 @@ def copy_live_environment(target_root, progress_callback=None):
         progress_callback("Live environment copy completed successfully.", 0.9)
     return True, ""
 
+def _kernel_version_key(name):
+    """Sort key for kernel release strings: numeric runs compare as integers (570 > 95)."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
 def setup_live_environment_post_copy(target_root, progress_callback=None, server_install=False):
     """Sets up the copied live environment for booting from the target disk.
     
@@ -2043,10 +2062,12 @@ GRUB_ENABLE_BLSCFG=true
         kver = None
         modules_dir = os.path.join(target_root, "lib", "modules")
         if os.path.isdir(modules_dir):
-            for name in sorted(os.listdir(modules_dir), reverse=True):
-                if not name.startswith(".") and os.path.isdir(os.path.join(modules_dir, name)):
-                    kver = name
-                    break
+            # Single scandir pass; version-aware max so 5.14.0-570 beats 5.14.0-95
+            with os.scandir(modules_dir) as it:
+                kver = max(
+                    (e.name for e in it if not e.name.startswith(".") and e.is_dir()),
+                    key=_kernel_version_key, default=None
+                )
         dracut_cmd = ["dracut", "--force", "--no-hostonly", "-v"]
         if kver:
             dracut_cmd.extend(["--kver", kver])
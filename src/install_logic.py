@@ -11,41 +11,72 @@
 import os
 import re
 import shutil
+import stat
 import subprocess
-import shlex
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 
 from utils import get_host_architecture
+# backend only imports this module lazily (install_bootloader_in_container), so binding
+# its helpers once here is safe and avoids an import-machinery lookup on every call.
+from backend import (
+    _run_command,
+    _run_in_chroot,
+    ensure_directory as _ensure_directory,
+    ensure_directories as _ensure_directories,
+    write_file_as_root as _write_file_as_root,
+    verify_grub_packages,
+)
 
-# Helpers from backend (imported at use site to avoid circular deps)
-def _run_command(command_list, description, progress_callback=None, timeout=None, pipe_input=None):
-    """Delegate to backend._run_command."""
-    from backend import _run_command as _rc
-    return _rc(command_list, description, progress_callback, timeout, pipe_input)
 
-def _run_in_chroot(target_root, command_list, description, progress_callback=None, timeout=None, pipe_input=None):
-    """Delegate to backend._run_in_chroot."""
-    from backend import _run_in_chroot as _rch
-    return _rch(target_root, command_list, description, progress_callback, timeout, pipe_input)
-
-def _ensure_directory(path, progress_callback=None):
-    """Delegate to backend.ensure_directory."""
-    from backend import ensure_directory
-    return ensure_directory(path, progress_callback)
-
-def _write_file_as_root(path, content, progress_callback=None):
-    """Delegate to backend.write_file_as_root."""
-    from backend import write_file_as_root
-    return write_file_as_root(path, content, progress_callback)
+BOOTLOADER_ID = "Oreon"
 
+# Successful verify_grub_packages results keyed on (target_root, rpmdb mtime)
+_VERIFY_CACHE = {}
 
-BOOTLOADER_ID = "Oreon"
 
 # --- UEFI and BIOS detection ---
+@lru_cache(maxsize=1)
 def is_uefi_system():
+    # Firmware type is fixed for the life of the boot
     return os.path.exists("/sys/firmware/efi")
 
 
+_MOUNTINFO_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape_mountinfo(field):
+    """Decode the octal escapes (\\040 for space etc.) the kernel uses in /proc/self/mountinfo."""
+    return _MOUNTINFO_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), field)
+
+
+def _mount_source(path):
+    """Return the source device of the mount containing path (like findmnt -o SOURCE --target),
+    read from /proc/self/mountinfo instead of exec'ing findmnt. None if it cannot be determined."""
+    try:
+        path = os.path.realpath(path)
+        best = ""
+        source = None
+        with open("/proc/self/mountinfo", "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                parts = line.split()
+                if "-" not in parts:
+                    continue
+                sep = parts.index("-")
+                mount_point = _unescape_mountinfo(parts[4])
+                if path != mount_point and not path.startswith(mount_point.rstrip("/") + "/"):
+                    continue
+                # >= so a later mount stacked on the same mount point wins, as in the kernel
+                if len(mount_point) >= len(best) and len(parts) > sep + 2:
+                    best = mount_point
+                    source = _unescape_mountinfo(parts[sep + 2])
+        return source
+    except (OSError, ValueError):
+        return None
+
+
 def _efi_partition_ensure_mounted(target_root, efi_partition_device, progress_callback=None):
     """Ensure the *target* EFI partition is mounted at target_root/boot/efi.
     If efi_partition_device is given, always use it (unmount and remount if something else is there)."""
@@ -53,30 +84,16 @@ def _efi_partition_ensure_mounted(target_root, efi_partition_device, progress_ca
     if not _ensure_directory(efi_mount, progress_callback):
         return False, "Failed to create EFI mount point", None
 
-    def _realpath(dev):
-        try:
-            return os.path.realpath(dev) if dev else None
-        except Exception:
-            return dev
-
     if efi_partition_device:
         # Ensure the target's ESP is mounted here; avoid writing to host's ESP by mistake.
-        want = _realpath(efi_partition_device)
         if os.path.ismount(efi_mount):
-            try:
-                r = subprocess.run(
-                    ["findmnt", "-n", "-o", "SOURCE", "--target", efi_mount],
-                    capture_output=True, text=True, check=False, timeout=10
-                )
-                current = _realpath(r.stdout.strip()) if r.returncode == 0 and r.stdout.strip() else None
-                if current and want and current != want:
-                    _run_command(["umount", efi_mount], "Unmount EFI for remount", progress_callback, timeout=15)
-                elif current == want:
-                    return True, "", efi_mount
-            except Exception:
-                pass
-            if os.path.ismount(efi_mount):
-                _run_command(["umount", efi_mount], "Unmount EFI", progress_callback, timeout=15)
+            current = _mount_source(efi_mount)
+            # Same spelling needs no symlink resolution; otherwise compare resolved paths
+            # (e.g. /dev/disk/by-id/... vs /dev/sda1), one realpath per side.
+            if current and (current == efi_partition_device or
+                            os.path.realpath(current) == os.path.realpath(efi_partition_device)):
+                return True, "", efi_mount
+            _run_command(["umount", efi_mount], "Unmount EFI for remount", progress_callback, timeout=15)
         ok, err, _ = _run_command(
             ["mount", efi_partition_device, efi_mount],
             "Mount EFI partition", progress_callback, timeout=30
@@ -85,44 +102,84 @@ def _efi_partition_ensure_mounted(target_root, efi_partition_device, progress_ca
             return False, err or "Failed to mount EFI partition", None
         return True, "", efi_mount
 
-    if os.path.ismount(efi_mount):
+    if os.path.ismount(efi_mount) or _mount_source(efi_mount):
         return True, "", efi_mount
+    return False, "UEFI system but EFI partition not mounted and no device provided.", None
+
+
+def _fs_uuid(target):
+    """Return the UUID of the filesystem mounted at (or containing) target.
+    Resolves the mount source from mountinfo against /dev/disk/by-uuid; only execs
+    findmnt when that fails (e.g. no udev symlink for the device)."""
+    source = _mount_source(target)
+    if source and source.startswith("/dev/"):
+        by_uuid = "/dev/disk/by-uuid"
+        try:
+            source_real = os.path.realpath(source)
+            for name in os.listdir(by_uuid):
+                if os.path.realpath(os.path.join(by_uuid, name)) == source_real:
+                    return name
+        except OSError:
+            pass
     try:
         r = subprocess.run(
-            ["findmnt", "-n", "-o", "SOURCE", "--target", efi_mount],
+            ["findmnt", "-n", "-o", "UUID", "--target", target],
             capture_output=True, text=True, check=False, timeout=10
         )
         if r.returncode == 0 and r.stdout.strip():
-            return True, "", efi_mount
+            return r.stdout.strip()
     except Exception:
         pass
-    return False, "UEFI system but EFI partition not mounted and no device provided.", None
+    return None
 
 
 def _get_root_uuid(target_root):
     """Return UUID of the filesystem mounted at target_root (root partition)."""
+    return _fs_uuid(target_root)
+
+
+def _listdir_priv(path, progress_callback=None):
+    """Return the entry names in path, or None if it is missing or cannot be listed.
+    Uses os.scandir; only falls back to a privileged ls if path is not readable by us."""
     try:
-        r = subprocess.run(
-            ["findmnt", "-n", "-o", "UUID", "--target", target_root],
-            capture_output=True, text=True, check=False, timeout=10
-        )
-        if r.returncode == 0 and r.stdout.strip():
-            return r.stdout.strip()
-    except Exception:
+        with os.scandir(path) as it:
+            return [e.name for e in it]
+    except PermissionError:
         pass
-    return None
+    except OSError:
+        return None
+    ok, _, out = _run_command(["ls", "-1", path], "List %s" % path, progress_callback, timeout=5)
+    if not ok:
+        return None
+    return [n.strip() for n in (out or "").splitlines() if n.strip()]
 
 
-def _efi_file_readable(path):
-    """Check if path exists, is a regular file, and has size > 0. Uses sudo for EFI partition access."""
-    ok, _, _ = _run_command(["test", "-f", path, "-a", "-s", path], "Check EFI file", None, timeout=5)
-    return ok
+def _efi_files_readable(paths):
+    """Return the subset of paths that exist as non-empty regular files.
+    Stats in-process; paths we cannot stat ourselves are checked with a single privileged shell loop, not one test each."""
+    found = set()
+    denied = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            if stat.S_ISREG(st.st_mode) and st.st_size > 0:
+                found.add(p)
+        except PermissionError:
+            denied.append(p)
+        except OSError:
+            pass
+    if denied:
+        script = 'for p do [ -f "$p" ] && [ -s "$p" ] && printf "%s\\n" "$p"; done; true'
+        ok, _, out = _run_command(["sh", "-c", script, "sh"] + denied, "Check EFI files", None, timeout=10)
+        if ok and out:
+            found.update(line for line in out.splitlines() if line)
+    return found
 
 
 def _find_shim_grub_on_host():
     """Find shim and grub EFI files on host (live system) /boot/efi or /efi.
     Returns (shim_path, grub_path, efi_vendor). Uses architecture-specific file names (x64/aa64).
-    Uses privileged check (sudo test) because /boot/efi may not be readable by liveuser."""
+    All candidates are checked in one batch (privileged if /boot/efi is not readable by liveuser)."""
     arch = get_host_architecture()
     efi_shim = arch["efi_shim"]
     efi_grub = arch["efi_grub"]
@@ -130,19 +187,20 @@ def _find_shim_grub_on_host():
     vendors = ["fedora", "centos", "rhel", "rocky", "almalinux", "oreon"]
     for efi_root in ["/boot/efi", "/efi"]:
         host_efi = os.path.join(efi_root, "EFI")
-        ok, _, _ = _run_command(["test", "-d", host_efi], "Check EFI dir", None, timeout=5)
-        if not ok:
+        names = _listdir_priv(host_efi)
+        if not names:
             continue
-        ok, _, ls_out = _run_command(["ls", "-1", host_efi], "List EFI dir", None, timeout=5)
-        if not ok or not ls_out:
-            continue
-        names = [n.strip() for n in ls_out.splitlines() if n.strip()]
+        # Only probe vendor dirs that exist; each miss would otherwise cost a privileged test.
+        present = set(names)
+        known_vendors = [v for v in vendors if v in present]
+        candidates = [os.path.join(host_efi, name, f) for name in names for f in (efi_shim, efi_boot, efi_grub)]
+        found = _efi_files_readable(candidates)
         shim = None
         grub = None
         efi_vendor = None
-        for v in vendors:
+        for v in known_vendors:
             p = os.path.join(host_efi, v, efi_shim)
-            if _efi_file_readable(p):
+            if p in found:
                 shim = p
                 efi_vendor = v
                 break
@@ -152,35 +210,35 @@ def _find_shim_grub_on_host():
                     continue
                 for f in (efi_shim, efi_boot):
                     p = os.path.join(host_efi, name, f)
-                    if _efi_file_readable(p):
+                    if p in found:
                         shim = p
                         efi_vendor = name
                         break
                 if shim:
                     break
-        if not shim:
+        if not shim and "BOOT" in present:
             boot_dir = os.path.join(host_efi, "BOOT")
             for f in (efi_boot, efi_shim):
                 p = os.path.join(boot_dir, f)
-                if _efi_file_readable(p):
+                if p in found:
                     shim = p
                     break
         if not shim:
             continue
-        for v in ([efi_vendor] if efi_vendor else vendors):
+        for v in ([efi_vendor] if efi_vendor else known_vendors):
             p = os.path.join(host_efi, v, efi_grub)
-            if _efi_file_readable(p):
+            if p in found:
                 grub = p
                 efi_vendor = efi_vendor or v
                 break
-        if not grub:
+        if not grub and "BOOT" in present:
             p = os.path.join(host_efi, "BOOT", efi_grub)
-            if _efi_file_readable(p):
+            if p in found:
                 grub = p
         if not grub:
             for name in names:
                 p = os.path.join(host_efi, name, efi_grub)
-                if _efi_file_readable(p):
+                if p in found:
                     grub = p
                     efi_vendor = efi_vendor or name
                     break
@@ -189,6 +247,130 @@ def _find_shim_grub_on_host():
     return None, None, None
 
 
+def _copy_efi_dir_files(src_dir, dst_dir, progress_callback=None):
+    """Copy every non-empty regular file in src_dir (host EFI/<vendor>) into dst_dir on the ESP.
+    As root: one os.scandir pass and shutil.copyfile (sendfile) per file; mode/times are not
+    preserved (FAT ignores them). Otherwise: one batched test and one privileged cp -t.
+    Returns (success, error_msg); failures are collected rather than stopping at the first one."""
+    errors = []
+    if os.geteuid() == 0:
+        try:
+            with os.scandir(src_dir) as it:
+                entries = [e for e in it if e.is_file()]
+        except OSError as e:
+            return False, f"Failed to list {src_dir}: {e}"
+        for entry in entries:
+            try:
+                if entry.stat().st_size == 0:
+                    continue
+                shutil.copyfile(entry.path, os.path.join(dst_dir, entry.name))
+            except OSError as e:
+                errors.append(f"Failed to copy {entry.name} from host EFI: {e}")
+        return not errors, "; ".join(errors)
+
+    names = _listdir_priv(src_dir, progress_callback)
+    if names:
+        found = _efi_files_readable([os.path.join(src_dir, n) for n in names])
+        if found:
+            ok, err, _ = _run_command(["cp", "-t", dst_dir] + sorted(found), "Copy host EFI files to EFI", progress_callback)
+            if not ok:
+                errors.append(err or "Failed to copy files from host EFI")
+    return not errors, "; ".join(errors)
+
+
+def _copy_file_pairs(pairs, description, progress_callback=None):
+    """Copy each (src, dst) pair: shutil.copyfile as root, otherwise one privileged sh invocation
+    instead of one cp per file. Stops at the first failing copy. Returns (success, error_msg, stdout)."""
+    if os.geteuid() == 0:
+        for src, dst in pairs:
+            try:
+                shutil.copyfile(src, dst)
+            except OSError as e:
+                err = f"{description} failed: {e}"
+                print(f"ERROR: {err}")
+                return False, err, ""
+        return True, "", ""
+    script = 'while [ $# -gt 0 ]; do cp "$1" "$2" || exit 1; shift 2; done'
+    args = [p for pair in pairs for p in pair]
+    return _run_command(["sh", "-c", script, "sh"] + args, description, progress_callback)
+
+
+# Partition device -> (disk, partition number) for efibootmgr: /dev/nvme0n1p1, /dev/mmcblk0p1, /dev/sda1.
+# nvme/mmcblk come first so /dev/nvme0n1p1 is not split as disk /dev/nvme, partition 0.
+_EFI_PART_RE = re.compile(
+    r"^(?P<disk>/dev/(?:nvme\d+n\d+|mmcblk\d+))p(?P<part>\d+)$|^(?P<disk2>/dev/[a-zA-Z]+)(?P<part2>\d+)$"
+)
+
+
+def _start_nvram_entry(efi_partition_device, efi_install_id, arch):
+    """Start efibootmgr in the background to add an NVRAM entry pointing at shim in EFI/<efi_install_id>.
+    Returns the Popen (caller waits on it) or None if the device name cannot be split into disk/partition."""
+    match = _EFI_PART_RE.match(efi_partition_device)
+    if not match:
+        return None
+    efi_disk = match.group("disk") or match.group("disk2")
+    efi_part = match.group("part") or match.group("part2")
+    loader = "\\EFI\\" + efi_install_id + "\\" + arch["efi_shim"].replace("/", "\\")
+    cmd = ["efibootmgr", "-c", "-d", efi_disk, "-p", efi_part, "-L", efi_install_id, "-l", loader]
+    if os.geteuid() != 0:
+        cmd = ["sudo"] + cmd
+    print(f"Executing Backend Step (background): Add NVRAM boot entry -> {' '.join(cmd)}")
+    try:
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    except OSError as e:
+        print(f"Warning: Could not start efibootmgr: {e}")
+        return None
+
+
+def _fsync_paths(paths):
+    """Best-effort fsync of files/directories; missing or unreadable paths are skipped."""
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _rmdir_quiet(path):
+    """os.rmdir, ignoring errors (e.g. a mount point that could not be unmounted)."""
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+def _rpmdb_key(target_root):
+    """Return (target_root, mtime_ns) of the target rpmdb, or None if no rpmdb is found."""
+    for rel in ("usr/lib/sysimage/rpm/rpmdb.sqlite", "var/lib/rpm/rpmdb.sqlite", "var/lib/rpm/Packages"):
+        try:
+            return target_root, os.stat(os.path.join(target_root, rel)).st_mtime_ns
+        except OSError:
+            continue
+    return None
+
+
+def _verify_grub_packages_cached(target_root):
+    """verify_grub_packages, skipped when the target rpmdb is unchanged since the last successful check.
+    Failures are not cached so a retry can install the missing packages."""
+    key = _rpmdb_key(target_root)
+    if key is not None and key in _VERIFY_CACHE:
+        print("GRUB packages already verified for unchanged rpmdb; skipping rpm queries.")
+        return _VERIFY_CACHE[key]
+    result = verify_grub_packages(target_root)
+    if result[0]:
+        # Key after the call: verify may have installed packages and touched the rpmdb
+        key = _rpmdb_key(target_root)
+        if key is not None:
+            _VERIFY_CACHE[key] = result
+    return result
+
+
 def _install_uefi_bootloader(target_root, primary_disk, efi_partition_device, progress_callback=None):
     """Install UEFI bootloader to match Anaconda/Oreon: EFI/<vendor> (e.g. almalinux),
     signed shim+grub from host, stub grub.cfg on ESP.
@@ -198,30 +380,43 @@ def _install_uefi_bootloader(target_root, primary_disk, efi_partition_device, pr
     if not os.path.exists(efi_partition_device):
         return False, "EFI partition device does not exist: %s" % efi_partition_device, None
 
-    from backend import verify_grub_packages
-    vok, verr, _ = verify_grub_packages(target_root)
+    # The target rpm check and the host ESP search are independent and both wait on
+    # subprocesses, so run them side by side.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        verify_future = pool.submit(_verify_grub_packages_cached, target_root)
+        host_future = pool.submit(_find_shim_grub_on_host)
+        vok, verr, _ = verify_future.result()
+        shim_src, grub_src, efi_vendor = host_future.result()
     if not vok:
         return False, verr or "Required GRUB packages missing.", None
 
-    shim_src, grub_src, efi_vendor = _find_shim_grub_on_host()
     if not shim_src or not grub_src:
         return False, "Host has no signed shim/grub in /boot/efi/EFI or /efi/EFI.", None
 
     arch = get_host_architecture()
     efi_install_id = efi_vendor if efi_vendor else BOOTLOADER_ID
-    tmp_mount = tempfile.mkdtemp(prefix="centrio_efi_")
-    try:
+    nvram_proc = None
+    # Every exit path unmounts exactly once, then removes the mount point. os.rmdir rather than
+    # TemporaryDirectory's rmtree: if umount fails, the ESP contents must not be deleted.
+    with ExitStack() as stack:
+        tmp_mount = tempfile.mkdtemp(prefix="centrio_efi_")
+        stack.callback(_rmdir_quiet, tmp_mount)
         ok, err, _ = _run_command(
             ["mount", efi_partition_device, tmp_mount],
             "Mount ESP at temp dir", progress_callback, timeout=30
         )
         if not ok:
             return False, err or "Failed to mount ESP at temp dir", None
+        stack.callback(_run_command, ["umount", tmp_mount], "Unmount ESP", progress_callback, timeout=15)
 
+        # All ESP destination paths, composed once.
         efi_dir = os.path.join(tmp_mount, "EFI", efi_install_id)
         efi_boot = os.path.join(tmp_mount, "EFI", "BOOT")
-        if not _ensure_directory(efi_dir, progress_callback) or not _ensure_directory(efi_boot, progress_callback):
-            _run_command(["umount", tmp_mount], "Unmount ESP", progress_callback, timeout=15)
+        shim_dst = os.path.join(efi_dir, arch["efi_shim"])
+        grub_dst = os.path.join(efi_dir, arch["efi_grub"])
+        boot_shim_dst = os.path.join(efi_boot, arch["efi_boot"])
+        efi_grub_cfg = os.path.join(efi_dir, "grub.cfg")
+        if not _ensure_directories([efi_dir, efi_boot], progress_callback):
             return False, "Failed to create EFI dirs on ESP", None
 
         host_vendor_dir = os.path.join("/boot/efi/EFI", efi_install_id)
@@ -229,87 +424,66 @@ def _install_uefi_bootloader(target_root, primary_disk, efi_partition_device, pr
         if not ok_dir:
             host_vendor_dir = os.path.join("/efi/EFI", efi_install_id)
             ok_dir, _, _ = _run_command(["test", "-d", host_vendor_dir], "Check host EFI vendor dir", progress_callback, timeout=5)
+        copies = [(shim_src, boot_shim_dst)]
         if ok_dir:
-            ok_ls, _, ls_out = _run_command(["ls", "-1", host_vendor_dir], "List host EFI vendor dir", progress_callback, timeout=5)
-            if ok_ls and ls_out:
-                for name in [n.strip() for n in ls_out.splitlines() if n.strip()]:
-                    src = os.path.join(host_vendor_dir, name)
-                    if _efi_file_readable(src):
-                        ok, err, _ = _run_command(["cp", src, os.path.join(efi_dir, name)], f"Copy {name} to EFI", progress_callback)
-                        if not ok:
-                            _run_command(["umount", tmp_mount], "Unmount ESP", progress_callback, timeout=15)
-                            return False, err or f"Failed to copy {name} from host EFI", None
+            ok, err = _copy_efi_dir_files(host_vendor_dir, efi_dir, progress_callback)
+            if not ok:
+                return False, err or "Failed to copy files from host EFI", None
         else:
-            for s, d in [(shim_src, os.path.join(efi_dir, arch["efi_shim"])), (grub_src, os.path.join(efi_dir, arch["efi_grub"]))]:
-                ok, err, _ = _run_command(["cp", s, d], "Copy shim/grub to EFI", progress_callback)
-                if not ok:
-                    _run_command(["umount", tmp_mount], "Unmount ESP", progress_callback, timeout=15)
-                    return False, err or "Failed to copy shim/grub", None
+            copies = [(shim_src, shim_dst), (grub_src, grub_dst)] + copies
 
-        ok, err, _ = _run_command(["cp", shim_src, os.path.join(efi_boot, arch["efi_boot"])], "Copy shim to EFI/BOOT", progress_callback)
+        ok, err, _ = _copy_file_pairs(copies, "Copy shim/grub to EFI", progress_callback)
         if not ok:
-            _run_command(["umount", tmp_mount], "Unmount ESP", progress_callback, timeout=15)
-            return False, err or "Failed to copy shim to EFI/BOOT", None
+            return False, err or "Failed to copy shim/grub to EFI", None
 
         root_uuid = _get_root_uuid(target_root)
         if not root_uuid:
-            _run_command(["umount", tmp_mount], "Unmount ESP", progress_callback, timeout=15)
             return False, "Could not determine root filesystem UUID for GRUB stub.", None
 
         stub_cfg = (
             "search.fs_uuid %s root\nset prefix=($root)/boot/grub2\nconfigfile $prefix/grub.cfg\n"
             % root_uuid
         )
-        efi_grub_cfg = os.path.join(efi_dir, "grub.cfg")
         if not _write_file_as_root(efi_grub_cfg, stub_cfg, progress_callback):
-            _run_command(["umount", tmp_mount], "Unmount ESP", progress_callback, timeout=15)
             return False, "Failed to write stub grub.cfg on ESP", None
 
-        try:
-            os.sync()
-        except Exception:
-            pass
-        _run_command(["umount", tmp_mount], "Unmount ESP", progress_callback, timeout=15)
-    finally:
-        if os.path.ismount(tmp_mount):
-            _run_command(["umount", tmp_mount], "Unmount ESP", progress_callback, timeout=15)
-        try:
-            os.rmdir(tmp_mount)
-        except Exception:
-            pass
+        # Start the NVRAM update now so efibootmgr runs while the ESP is flushed and unmounted.
+        nvram_proc = _start_nvram_entry(efi_partition_device, efi_install_id, arch)
+        # Flush only what we wrote on the ESP (os.sync() would stall on every dirty page of the
+        # rootfs copy); umount writes back anything left.
+        _fsync_paths([shim_dst, grub_dst, boot_shim_dst, efi_grub_cfg, efi_dir, efi_boot])
 
-    # NVRAM: point to shim in vendor dir
-    match = (re.match(r"(/dev/[a-zA-Z]+)(\d+)", efi_partition_device) or
-            re.match(r"(/dev/nvme\d+n\d+)p(\d+)", efi_partition_device) or
-            re.match(r"(/dev/mmcblk\d+)p(\d+)", efi_partition_device))
-    if match:
-        efi_disk, efi_part = match.group(1), match.group(2)
-        arch = get_host_architecture()
-        loader = "\\EFI\\" + efi_install_id + "\\" + arch["efi_shim"].replace("/", "\\")
-        _run_command(
-            ["efibootmgr", "-c", "-d", efi_disk, "-p", efi_part, "-L", efi_install_id, "-l", loader],
-            "Add NVRAM boot entry", progress_callback, timeout=60
-        )
+    if nvram_proc:
+        try:
+            out, errout = nvram_proc.communicate(timeout=60)
+            if nvram_proc.returncode == 0:
+                print("SUCCESS: Add NVRAM boot entry completed.")
+            else:
+                print(f"Warning: Add NVRAM boot entry failed: {(errout or out).strip()}")
+        except subprocess.TimeoutExpired:
+            nvram_proc.kill()
+            nvram_proc.wait()
+            print("Warning: Add NVRAM boot entry timed out after 60s.")
 
     return True, "", efi_install_id
 
 
+# nvme: /dev/nvme0n1p2 -> /dev/nvme0n1
+_NVME_DEV = re.compile(r"^(/dev/nvme\d+n\d+)p?\d*$")
+# mmcblk: /dev/mmcblk0p2 -> /dev/mmcblk0
+_MMC_DEV = re.compile(r"^(/dev/mmcblk\d+)p?\d*$")
+# sdX, vdX, xvdX: /dev/sda2 -> /dev/sda
+_SD_DEV = re.compile(r"^(/dev/[a-z]+)\d*$")
+
+
 def _device_to_disk(device):
     """Return base disk path for grub2-install. /dev/sda2 -> /dev/sda, /dev/nvme0n1p2 -> /dev/nvme0n1."""
     if not device or not device.startswith("/dev/"):
         return device
-    # nvme: /dev/nvme0n1p2 -> /dev/nvme0n1
-    m = re.match(r"^(/dev/nvme\d+n\d+)p?\d*$", device)
-    if m:
-        return m.group(1)
-    # mmcblk: /dev/mmcblk0p2 -> /dev/mmcblk0
-    m = re.match(r"^(/dev/mmcblk\d+)p?\d*$", device)
-    if m:
-        return m.group(1)
-    # sdX, vdX, xvdX: /dev/sda2 -> /dev/sda
-    m = re.match(r"^(/dev/[a-z]+)\d*$", device)
-    if m:
-        return m.group(1)
+    for pattern in (_NVME_DEV, _MMC_DEV, _SD_DEV):
+        m = pattern.match(device)
+        if m:
+            return m.group(1)
     return device
 
 
@@ -321,7 +495,6 @@ def _install_bios_bootloader(target_root, primary_disk, progress_callback=None):
     if not arch.get("has_bios", True):
         return False, "Legacy BIOS bootloader not supported on ARM64 (UEFI only)."
     disk = _device_to_disk(primary_disk)
-    from backend import _run_command
     boot_dir = os.path.join(target_root, "boot")
     ok, err, stdout = _run_command(
         ["grub2-install", "--target=i386-pc", "--force", "--recheck",
@@ -337,51 +510,61 @@ def _install_bios_bootloader(target_root, primary_disk, progress_callback=None):
 
 def _get_live_root_uuid():
     """Return UUID of the live system's root filesystem (/)."""
+    return _fs_uuid("/")
+
+
+# "linux <kernel> <args>" / "linuxefi ..." lines in grub.cfg (cmd, kernel path, args)
+_GRUB_LINUX_LINE = re.compile(r"^(linux(?:efi)?)[ \t]+(\S+)[ \t]+(\S.*?)[ \t\r]*$", re.M)
+# Kernel args that refer to the live system's storage and must not reach the target
+_GRUB_DROPPED_ARGS = ("resume=", "rd.lvm.lv=", "rootflags=")
+
+
+def _patch_grub_linux_line(match):
+    """re.sub callback: drop live-only storage args and make sure the boot is quiet with Plymouth."""
+    args = [a for a in match.group(3).split() if not a.startswith(_GRUB_DROPPED_ARGS)]
+    for param in ["quiet", "splash", "rhgb", "rd.plymouth=1"]:
+        if param not in args:
+            args.append(param)
+    return match.group(1) + " " + match.group(2) + " " + " ".join(args)
+
+
+def _read_text_priv(path, progress_callback=None):
+    """Return the text of path, or None. Reads directly; falls back to sudo cat if not readable
+    by us (grub.cfg is 0600)."""
     try:
-        r = subprocess.run(
-            ["findmnt", "-n", "-o", "UUID", "--target", "/"],
-            capture_output=True, text=True, check=False, timeout=10
-        )
-        if r.returncode == 0 and r.stdout.strip():
-            return r.stdout.strip()
-    except Exception:
-        pass
-    return None
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except PermissionError:
+        ok, _, content = _run_command(["cat", path], "Read %s" % path, progress_callback, timeout=10)
+        return content if ok else None
+    except OSError:
+        return None
+
+
+def _patch_grub_cfg_content(content, live_uuid, target_root_uuid):
+    """Point a live grub.cfg at the target root and make its kernel lines boot quietly."""
+    # Replace live root UUID with target root UUID (handles search.fs_uuid, root=UUID=..., etc.)
+    content = content.replace(live_uuid, target_root_uuid)
+    # Ensure quiet splash in kernel cmdline so Plymouth boot screen shows (not verbose log)
+    content = _GRUB_LINUX_LINE.sub(_patch_grub_linux_line, content)
+    if not content.endswith("\n"):
+        content += "\n"
+    return content
 
 
 def _copy_grub_cfg_from_live_and_patch_uuid(target_root, target_root_uuid, progress_callback=None):
     """Copy /boot/grub2/grub.cfg from live env to target and replace live root UUID with target's.
-    Uses sudo cat to read live file (may not be readable by liveuser)."""
+    Reads the live file directly; falls back to sudo cat if it is not readable by liveuser."""
     live_grub_cfg = "/boot/grub2/grub.cfg"
     cfg_path = os.path.join(target_root, "boot", "grub2", "grub.cfg")
-    ok, _, content = _run_command(["cat", live_grub_cfg], "Read live grub.cfg", progress_callback, timeout=10)
-    if not ok or not content or len(content.strip()) < 50:
+    content = _read_text_priv(live_grub_cfg, progress_callback)
+    if not content or len(content.strip()) < 50:
         return False, "Live system has no usable /boot/grub2/grub.cfg to copy."
     live_uuid = _get_live_root_uuid()
     if not live_uuid:
         return False, "Could not determine live root UUID for grub.cfg patch."
     try:
-        # Replace live root UUID with target root UUID (handles search.fs_uuid, root=UUID=..., etc.)
-        content = content.replace(live_uuid, target_root_uuid)
-        # Ensure quiet splash in kernel cmdline so Plymouth boot screen shows (not verbose log)
-        lines_out = []
-        for line in content.splitlines():
-            stripped = line.rstrip()
-            if stripped.startswith("linux ") or stripped.startswith("linuxefi "):
-                parts = stripped.split(None, 2)  # cmd, path, rest
-                if len(parts) >= 3:
-                    args = [a for a in parts[2].split()
-                            if not a.startswith("resume=") and not a.startswith("rd.lvm.lv=")
-                            and not a.startswith("rootflags=")]
-                    for param in ["quiet", "splash", "rhgb", "rd.plymouth=1"]:
-                        if param not in args:
-                            args.append(param)
-                    lines_out.append(parts[0] + " " + parts[1] + " " + " ".join(args))
-                else:
-                    lines_out.append(stripped)
-            else:
-                lines_out.append(stripped)
-        content = "\n".join(lines_out) + "\n"
+        content = _patch_grub_cfg_content(content, live_uuid, target_root_uuid)
         if not _ensure_directory(os.path.dirname(cfg_path), progress_callback):
             return False, "Failed to create grub config directory."
         if not _write_file_as_root(cfg_path, content, progress_callback):
@@ -394,13 +577,39 @@ def _copy_grub_cfg_from_live_and_patch_uuid(target_root, target_root_uuid, progr
         return False, "Failed to copy/patch grub.cfg from live: %s" % e
 
 
+def _grub_cfg_is_current(target_root, cfg_path):
+    """Return True if cfg_path is non-trivial and newer than everything grub2-mkconfig reads:
+    installed kernels, BLS entries and /etc/default/grub. The grub.cfg copied from the live
+    image is always older than the BLS entries/defaults rewritten after the copy, so it never
+    counts as current. Any stat/listing error means "regenerate"."""
+    try:
+        st = os.stat(cfg_path)
+        if st.st_size < 100:
+            return False
+        inputs = [os.path.join(target_root, "etc", "default", "grub")]
+        boot_dir = os.path.join(target_root, "boot")
+        inputs.extend(os.path.join(boot_dir, f) for f in os.listdir(boot_dir) if f.startswith("vmlinuz-"))
+        bls_dir = os.path.join(boot_dir, "loader", "entries")
+        if os.path.isdir(bls_dir):
+            inputs.extend(os.path.join(bls_dir, f) for f in os.listdir(bls_dir))
+        newest = max((os.stat(p).st_mtime for p in inputs if os.path.exists(p)), default=0)
+        return st.st_mtime >= newest
+    except OSError:
+        return False
+
+
 def _generate_grub_cfg(target_root, primary_disk, is_uefi, progress_callback=None):
     """Generate /boot/grub2/grub.cfg for target (must run inside chroot to see target's /boot). Returns (success, error_msg).
     GRUB_DISABLE_OS_PROBER=true avoids os-prober scanning block devices in chroot, which can hang indefinitely.
+    Skips grub2-mkconfig when an up-to-date grub.cfg already exists (e.g. written by a kernel scriptlet).
     If grub2-mkconfig produces empty/small output, falls back to copying grub.cfg from the live env and patching root UUID."""
     grub_cfg_chroot = "/boot/grub2/grub.cfg"
     cfg_path = os.path.join(target_root, "boot", "grub2", "grub.cfg")
 
+    if _grub_cfg_is_current(target_root, cfg_path):
+        print("grub.cfg on target is newer than kernels, BLS entries and /etc/default/grub; skipping grub2-mkconfig.")
+        return True, ""
+
     ok, err, _ = _run_in_chroot(
         target_root,
         ["env", "GRUB_DISABLE_OS_PROBER=true", "grub2-mkconfig", "-o", grub_cfg_chroot],
@@ -416,8 +625,11 @@ def _generate_grub_cfg(target_root, primary_disk, is_uefi, progress_callback=Non
                 return True, ""
         return False, err or "grub2-mkconfig failed."
 
-    ok_stat, _, size_out = _run_command(["stat", "-c", "%s", cfg_path], "Check grub.cfg size", progress_callback, timeout=5)
-    if ok_stat and size_out and size_out.strip().isdigit() and int(size_out.strip()) >= 100:
+    try:
+        size = os.stat(cfg_path).st_size
+    except OSError:
+        size = 0
+    if size >= 100:
         return True, ""
 
     # grub2-mkconfig produced empty or too-small output; fall back to live env
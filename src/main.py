@@ -5,10 +5,27 @@ Centrio Installer - Main entry point
 
 import sys
 import os
-import platform
+
+# --- Privileged helper mode (for live session: oreon-installer-priv runs us as root) ---
+# Handled before anything else: the helper is re-exec'd for every privileged command.
+if "--backend=priv" in sys.argv:
+    idx = sys.argv.index("--backend=priv")
+    cmd_argv = sys.argv[idx + 1:]
+    if not cmd_argv:
+        sys.exit(1)
+    try:
+        # Replace this process with the command: no extra child to wait on, and
+        # stdin/stdout/stderr and the exit status pass straight through.
+        os.execvp(cmd_argv[0], cmd_argv)
+    except FileNotFoundError:
+        print(f"Command not found: {cmd_argv[0]}", file=sys.stderr)
+        sys.exit(127)
+    except OSError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
 
 # work around MESA "Failed to attach to x11 shm" (common on ARM/Wayland)
-if platform.machine().lower() in ("aarch64", "arm64"):
+if os.uname().machine in ("aarch64", "arm64"):
     for k, v in [
         ("GDK_BACKEND", "x11"),
         ("LIBGL_ALWAYS_SOFTWARE", "1"),
@@ -19,31 +36,14 @@ if platform.machine().lower() in ("aarch64", "arm64"):
         ("_MITSHM", "0"),
     ]:
         os.environ[k] = v
-import subprocess
 import logging
 import gettext
 import locale
 from pathlib import Path
 
-# --- Privileged helper mode (for live session: oreon-installer-priv runs us as root) ---
-if "--backend=priv" in sys.argv:
-    idx = sys.argv.index("--backend=priv")
-    cmd_argv = sys.argv[idx + 1:]
-    if not cmd_argv:
-        sys.exit(1)
-    try:
-        result = subprocess.run(cmd_argv, stdin=sys.stdin, timeout=None)
-        sys.exit(result.returncode)
-    except FileNotFoundError:
-        print(f"Command not found: {cmd_argv[0]}", file=sys.stderr)
-        sys.exit(127)
-    except Exception as e:
-        print(str(e), file=sys.stderr)
-        sys.exit(1)
-
-# Set up logging
+# Set up logging (CENTRIO_DEBUG=1 for the detailed disk/partitioning trace)
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.DEBUG if os.environ.get("CENTRIO_DEBUG") else logging.INFO,
     format='%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
 )
 
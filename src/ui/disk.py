@@ -6,17 +6,44 @@ import json       # For parsing lsblk output
 import shlex      # For safe command string generation
 import os         # For path manipulation
 import re # For parsing losetup
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import Gtk, Adw, GLib
 
+try:
+    # Several times faster than the stdlib on big lsblk trees; optional
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 from .base import BaseConfigurationPage
 import backend
+
+log = logging.getLogger(__name__)
+
+# Fixed probe command lines, built once
+_LSBLK_SCAN_CMD = ("lsblk", "-J", "-b", "-p", "-o", "NAME,PATH,SIZE,MODEL,TYPE,PKNAME,MOUNTPOINT,TRAN,FSTYPE,PARTTYPE")
+_LSBLK_EFI_CMD = ("lsblk", "-J", "-o", "PATH,FSTYPE,PARTTYPE,SIZE")
+_FINDMNT_CMD = ("findmnt", "-J", "-o", "SOURCE,TARGET,FSTYPE,OPTIONS")
+_PVS_CMD = ("pvs", "--noheadings", "-o", "pv_name")
+_LOSETUP_CMD = ("losetup", "-J")
+_FINDMNT_EFI_SOURCE_CMD = ("findmnt", "-n", "-o", "SOURCE", "/boot/efi")
+
+# lsblk MODEL substrings that mark optical drives (never installation targets)
+_OPTICAL_MODEL_TOKENS = ("CD", "DVD")
+
+# Firmware type can't change while the installer runs; probe it once
+_IS_UEFI = os.path.exists("/sys/firmware/efi")
 # D-Bus imports are no longer needed here
 # from ..utils import dasbus, DBusError, dbus_available 
 # from ..constants import (...) 
 
-# Helper function to format size
+# Helper function to format size (disks come in a handful of sizes; memoized)
+@lru_cache(maxsize=256)
 def format_bytes(size_bytes):
     if size_bytes is None:
         return "N/A"
@@ -33,6 +60,10 @@ def generate_wipefs_command(disk_path):
     """Generates the wipefs command for a disk."""
     return ["wipefs", "-a", disk_path]
 
+def _parted(disk_path, *args):
+    """parted command line for disk_path in script mode."""
+    return ["parted", "-s", disk_path, *args]
+
 def generate_gpt_commands(disk_path, efi_size_mb=512, filesystem="btrfs", dual_boot=False, preserve_efi=False, bios_mode=False):
     """Generates parted commands for GPT layout.
     - UEFI (bios_mode=False): creates EFI System Partition + root
@@ -40,7 +71,7 @@ def generate_gpt_commands(disk_path, efi_size_mb=512, filesystem="btrfs", dual_b
     """
     commands = []
     if not disk_path:
-        print("ERROR: generate_gpt_commands called without disk_path")
+        log.error("generate_gpt_commands called without disk_path")
         return []
 
     # Define partition start and end points
@@ -56,28 +87,28 @@ def generate_gpt_commands(disk_path, efi_size_mb=512, filesystem="btrfs", dual_b
         # Make it 4 MiB to satisfy alignment and tool thresholds
         root_start = "4MiB"
         root_end = "100%"
-        commands.append(["parted", "-s", disk_path, "mklabel", "gpt"])
-        commands.append(["parted", "-s", disk_path, "mkpart", "\"BIOS boot\"", "", first_start, bios_end])
-        commands.append(["parted", "-s", disk_path, "set", "1", "bios_grub", "on"])
-        commands.append(["parted", "-s", disk_path, "mkpart", "\"Linux filesystem\"", filesystem, root_start, root_end])
+        commands.append(_parted(disk_path, "mklabel", "gpt"))
+        commands.append(_parted(disk_path, "mkpart", "\"BIOS boot\"", "", first_start, bios_end))
+        commands.append(_parted(disk_path, "set", "1", "bios_grub", "on"))
+        commands.append(_parted(disk_path, "mkpart", "\"Linux filesystem\"", filesystem, root_start, root_end))
     else:
         if dual_boot and preserve_efi:
             # Create partition in actual free space (user must have unallocated space)
             region = get_free_space_region(disk_path)
             if not region:
-                print("ERROR: Dual boot requires free space but none found on disk.")
+                log.error("Dual boot requires free space but none found on disk.")
                 return []
             root_start, root_end = region
-            commands.append(["parted", "-s", disk_path, "mkpart", "\"Linux filesystem\"", filesystem, root_start, root_end])
+            commands.append(_parted(disk_path, "mkpart", "\"Linux filesystem\"", filesystem, root_start, root_end))
         else:
             # Normal UEFI installation - create full layout
             root_start = efi_end
             root_end = "100%"
-            commands.append(["parted", "-s", disk_path, "mklabel", "gpt"])
-            commands.append(["parted", "-s", disk_path, "mkpart", "\"EFI System Partition\"", "fat32", first_start, efi_end])
-            commands.append(["parted", "-s", disk_path, "set", "1", "boot", "on"])
-            commands.append(["parted", "-s", disk_path, "set", "1", "esp", "on"])
-            commands.append(["parted", "-s", disk_path, "mkpart", "\"Linux filesystem\"", filesystem, root_start, root_end])
+            commands.append(_parted(disk_path, "mklabel", "gpt"))
+            commands.append(_parted(disk_path, "mkpart", "\"EFI System Partition\"", "fat32", first_start, efi_end))
+            commands.append(_parted(disk_path, "set", "1", "boot", "on"))
+            commands.append(_parted(disk_path, "set", "1", "esp", "on"))
+            commands.append(_parted(disk_path, "mkpart", "\"Linux filesystem\"", filesystem, root_start, root_end))
     
     return commands
 
@@ -112,32 +143,43 @@ def generate_mkfs_commands(disk_path, filesystem="btrfs", partition_prefix="", d
 
 # --- Helper Functions to Check Host Usage ---
 
+def _mounts_from_findmnt(mount_data):
+    """Flatten findmnt -J output into {target: source}.
+
+    findmnt nests each mount under its parent's "children", so the whole tree is
+    walked; an over-mounted target keeps the source of the mount seen last (the top one).
+    """
+    mounts = {}
+    stack = list(reversed(mount_data.get("filesystems") or []))
+    while stack:
+        fs = stack.pop()
+        source = fs.get("source")
+        target = fs.get("target")
+        if source and target:
+            mounts[target] = source
+        stack.extend(reversed(fs.get("children") or []))
+    return mounts
+
 def get_host_mounts():
     """Gets currently mounted filesystems on the host."""
-    mounts = {}
     try:
-        cmd = ["findmnt", "-J", "-o", "SOURCE,TARGET,FSTYPE,OPTIONS"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=5)
-        mount_data = json.loads(result.stdout)
-        if "filesystems" in mount_data:
-            for fs in mount_data["filesystems"]:
-                source = fs.get("source")
-                target = fs.get("target")
-                if source and target:
-                    mounts[target] = source 
-        print(f"Detected host mounts: {mounts}")
+        cmd = _FINDMNT_CMD
+        # the JSON parser takes the raw bytes; no text-mode decode of the whole blob first
+        result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True, timeout=5)
+        mounts = _mounts_from_findmnt(_json_loads(result.stdout))
+        log.debug("Detected host mounts: %s", mounts)
         return mounts
     except Exception as e:
-        print(f"Warning: Failed to get host mounts using findmnt: {e}")
+        log.warning("Failed to get host mounts using findmnt: %s", e)
         return {}
 
 def get_host_lvm_pvs():
     """Gets active LVM Physical Volumes on the host."""
     pvs = set()
     try:
-        cmd = ["pvs", "--noheadings", "-o", "pv_name"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=5)
-        for line in result.stdout.splitlines():
+        cmd = _PVS_CMD
+        result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True, timeout=5)
+        for line in result.stdout.decode("utf-8", "replace").splitlines():
             pv_name = line.strip()
             if pv_name:
                 try:
@@ -145,54 +187,83 @@ def get_host_lvm_pvs():
                     pvs.add(real_path)
                 except Exception:
                     pvs.add(pv_name)
-        print(f"Detected host LVM PVs: {pvs}")
+        log.debug("Detected host LVM PVs: %s", pvs)
         return pvs
     except Exception as e:
-        print(f"Warning: Failed to get host LVM PVs: {e}")
+        log.warning("Failed to get host LVM PVs: %s", e)
         return set()
 
+def get_mount_source_for_path(path, mounts):
+    """Return the source of the mount containing path, given get_host_mounts() output."""
+    best = None
+    for target, source in mounts.items():
+        if path == target or path.startswith(target.rstrip("/") + "/"):
+            if best is None or len(target) > len(best[0]):
+                best = (target, source)
+    return best[1] if best else None
+
+def get_loop_backing_files():
+    """Return {loop device path: backing file} for all loop devices from a single losetup -J.
+    Raises subprocess.CalledProcessError if losetup fails."""
+    result = subprocess.run(_LOSETUP_CMD, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True, timeout=5)
+    if not result.stdout.strip():
+        return {}  # no loop devices: losetup prints nothing
+    loop_data = _json_loads(result.stdout)
+    return {ld.get("name"): ld.get("back-file") for ld in loop_data.get("loopdevices", [])}
+
 def disk_has_unallocated_space(disk_path):
     """Check if a disk has unallocated (free) space for dual boot. Returns True if yes."""
     return get_free_space_region(disk_path) is not None
 
 
+# "parted -s <disk> unit MiB print free" free-space line: "  262144MiB  512000MiB  249856MiB   Free Space"
+_PARTED_FREE_RE = re.compile(rb"^\s*([\d.]+MiB)\s+([\d.]+MiB)\s+([\d.]+)MiB\s+Free Space", re.M)
+
+
+@lru_cache(maxsize=64)
 def get_free_space_region(disk_path):
     """Get the (start, end) of the largest free space region on disk for dual boot.
-    Returns (start_str, end_str) e.g. ('256GiB', '500GiB') or None if no free space."""
+    Returns (start_str, end_str) e.g. ('262144MiB', '512000MiB') or None if no free space.
+    Cached per disk until the next scan (DiskPage.scan_for_disks clears it)."""
     if not disk_path or not os.path.exists(disk_path):
         return None
     try:
         r = subprocess.run(
-            ["parted", "-s", disk_path, "unit", "MiB", "print", "free"],
-            capture_output=True, text=True, timeout=10
+            _parted(disk_path, "unit", "MiB", "print", "free"),
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10
         )
         if r.returncode != 0:
             return None
-        # Parse lines like "       262144MiB  512000MiB  249856MiB   Free Space"
-        lines = r.stdout.strip().split("\n")
         best_start, best_end, best_size_mb = None, None, 0
-        for line in lines:
-            if "Free Space" not in line and "free" not in line.lower():
-                continue
-            parts = line.split()
-            if len(parts) >= 3:
-                start_s, end_s, size_s = parts[0], parts[1], parts[2]
-                try:
-                    s = size_s.upper().replace("GIB", "").replace("MIB", "").replace("KB", "").replace("B", "").strip()
-                    num = float(s) if s else 0
-                    if "GIB" in size_s.upper() or "GB" in size_s.upper():
-                        num *= 1024  # to MiB
-                    if num > best_size_mb and num > 100:  # at least 100 MiB
-                        best_start, best_end, best_size_mb = start_s, end_s, num
-                except (ValueError, IndexError):
-                    pass
+        for m in _PARTED_FREE_RE.finditer(r.stdout):
+            size_mb = float(m.group(3))
+            if size_mb > best_size_mb and size_mb > 100:  # at least 100 MiB
+                best_start, best_end, best_size_mb = m.group(1), m.group(2), size_mb
         if best_start and best_end:
-            return (best_start, best_end)
+            return (best_start.decode(), best_end.decode())
         return None
     except Exception:
         return None
 
 
+def get_disks_with_free_space(disks):
+    """Return the frozenset of paths of disks (scan_for_disks entries, live OS disk excluded)
+    that have unallocated space for dual boot."""
+    paths = [d["path"] for d in disks if d.get("path") and not d.get("is_live_os_disk")]
+    if not paths:
+        return frozenset()
+    # One parted per disk; they only wait on the disks, so probe them all at once
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+        has_space = list(pool.map(disk_has_unallocated_space, paths))
+    return frozenset(path for path, ok in zip(paths, has_space) if ok)
+
+
+@lru_cache(maxsize=32)
+def partition_prefix_for(disk_path):
+    """Separator between a disk name and its partition number: "p" for nvme0n1 / mmcblk0, else ""."""
+    return "p" if "nvme" in disk_path or "mmcblk" in disk_path else ""
+
+
 def get_next_partition_device(disk_path, partition_prefix=""):
     """Return the device path for the next partition to be created (e.g. /dev/sda3).
     Used for dual boot where we add one partition to existing layout."""
@@ -201,84 +272,155 @@ def get_next_partition_device(disk_path, partition_prefix=""):
     try:
         r = subprocess.run(
             ["lsblk", "-n", "-o", "NAME", "-l", disk_path],
-            capture_output=True, text=True, timeout=10
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10
         )
         if r.returncode != 0:
             return None
         max_num = 0
         base = disk_path.split("/")[-1]  # e.g. sda or nvme0n1
-        for line in r.stdout.strip().split("\n"):
+        for line in r.stdout.decode("utf-8", "replace").splitlines():
             name = line.strip()
             if not name or name == base:
                 continue
             # sda1, sda2 or nvme0n1p1, nvme0n1p2
-            suffix = name[len(base):].lstrip("p")
+            suffix = name.removeprefix(base).lstrip("p")
             if suffix.isdigit():
                 max_num = max(max_num, int(suffix))
-        next_num = max_num + 1
-        if "nvme" in disk_path or "mmcblk" in disk_path:
-            return f"{disk_path}p{next_num}"
-        return f"{disk_path}{next_num}"
+        return f"{disk_path}{partition_prefix_for(disk_path)}{max_num + 1}"
     except Exception:
         return None
 
 
+# /dev/nvme0n1p2, /dev/mmcblk0p2 (optional "p" before the number) or /dev/sda2; one anchored pass.
+# The sdX branch keeps a greedy [a-zA-Z]+ so e.g. /dev/sdp1 -> /dev/sdp, not /dev/sd.
+_PARENT_DISK_RE = re.compile(
+    r"^(?:(?P<disk>/dev/(?:nvme\d+n\d+|mmcblk\d+))p?\d*|(?P<disk2>/dev/[a-zA-Z]+)\d*)$"
+)
+
+
 def get_parent_disk(partition_path):
     """Get the parent disk path for a partition (e.g. /dev/sda1 -> /dev/sda)."""
     if not partition_path:
         return None
-    m = re.match(r"^(/dev/[a-zA-Z]+)\d*$", partition_path) or \
-        re.match(r"^(/dev/nvme\d+n\d+)p?\d*$", partition_path) or \
-        re.match(r"^(/dev/mmcblk\d+)p?\d*$", partition_path)
-    return m.group(1) if m else None
+    m = _PARENT_DISK_RE.match(partition_path)
+    return (m.group("disk") or m.group("disk2")) if m else None
+
+
+# GPT partition type GUID of an EFI System Partition (lsblk PARTTYPE)
+EFI_PARTTYPE_GUID = "c12a7328-f81f-11d2-ba4b-00a0c93ec93b"
+
+
+def _dm_slave_device(dm_path):
+    """First device underneath a device-mapper node, from /sys/block/<dm-N>/slaves.
+    Returns "/dev/<name>", "" if the node has no slaves, or None if sysfs has no entry for it."""
+    dm_name = os.path.basename(os.path.realpath(dm_path))
+    try:
+        slaves = sorted(os.listdir(f"/sys/block/{dm_name}/slaves"))
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return f"/dev/{slaves[0]}" if slaves else ""
 
 
-def detect_existing_efi_partitions():
-    """Detect existing EFI system partitions that could be reused for dual boot."""
-    efi_guid = "c12a7328-f81f-11d2-ba4b-00a0c93ec93b"
+def _find_root_disk():
+    """Physical disk holding '/', from /proc/self/mountinfo and /sys/dev/block alone.
+    Returns "/dev/<disk>" when '/' sits on a real disk or one of its partitions; None for
+    overlay, device-mapper or loop roots, which need the lsblk trace."""
+    dev_id = None
+    try:
+        with open("/proc/self/mountinfo", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                fields = line.split(" ", 5)
+                if len(fields) > 4 and fields[4] == "/":
+                    dev_id = fields[2]  # major:minor; the last '/' entry is the visible one
+    except OSError:
+        return None
+    if not dev_id:
+        return None
+    sys_path = os.path.realpath(f"/sys/dev/block/{dev_id}")
+    if os.path.exists(os.path.join(sys_path, "partition")):
+        sys_path = os.path.dirname(sys_path)
+    # Only hardware-backed disks have a "device" link; dm-N and loopN live under /sys/devices/virtual
+    if not os.path.exists(os.path.join(sys_path, "device")):
+        return None
+    return f"/dev/{os.path.basename(sys_path)}"
+
+
+def _build_path_map(block_devices):
+    """Index an lsblk -J -p tree in one pass.
+    Returns (path_map, mountpoint_index): path_map maps every device path to
+    {"info": node, "pkname": parent path, "mountpoint": ...}; mountpoint_index maps
+    each mountpoint to the first device path found mounted there."""
+    path_map = {}
+    mountpoint_index = {}
+    stack = [(dev, None) for dev in reversed(block_devices or [])]
+    while stack:
+        dev, parent_path = stack.pop()
+        dev_path = dev.get("path")
+        if dev_path:
+            mountpoint = dev.get("mountpoint")
+            path_map[dev_path] = {
+                "info": dev,
+                "pkname": dev.get("pkname") or parent_path,
+                "mountpoint": mountpoint,
+            }
+            if mountpoint:
+                mountpoint_index.setdefault(mountpoint, dev_path)
+        for child in reversed(dev.get("children") or ()):
+            stack.append((child, dev_path or parent_path))
+    return path_map, mountpoint_index
+
+
+def detect_existing_efi_partitions(lsblk_data=None):
+    """Detect existing EFI system partitions that could be reused for dual boot.
+    lsblk_data: the JSON tree from DiskPage.scan_for_disks (needs PATH,FSTYPE,PARTTYPE,SIZE,MOUNTPOINT);
+    when given, no lsblk/findmnt is run and the mounted /boot/efi is taken from MOUNTPOINT."""
     efi_partitions = []
     seen_paths = set()
     try:
-        # Fallback: if /boot/efi is mounted, use that partition
-        ok_fm, _, out_fm = backend._run_command(
-            ["findmnt", "-n", "-o", "SOURCE", "/boot/efi"],
-            "Find EFI mount", timeout=5
-        )
-        if ok_fm and out_fm and out_fm.strip():
-            src = out_fm.strip()
-            if src and src not in seen_paths:
+        if lsblk_data is None:
+            # Fallback: if /boot/efi is mounted, use that partition
+            ok_fm, _, out_fm = backend._run_command(
+                _FINDMNT_EFI_SOURCE_CMD,
+                "Find EFI mount", timeout=5
+            )
+            efi_mount_sources = [out_fm.strip()] if ok_fm and out_fm and out_fm.strip() else []
+
+            cmd = _LSBLK_EFI_CMD
+            ok, _, stdout = backend._run_command(cmd, "List block devices for EFI", timeout=10)
+            if not ok:
+                raise RuntimeError("lsblk failed")
+            lsblk_data = _json_loads(stdout or "{}")
+        else:
+            efi_mount_sources = []
+            queue = list(lsblk_data.get("blockdevices", []))
+            while queue:
+                dev = queue.pop()
+                if dev.get("mountpoint") == "/boot/efi" and dev.get("path"):
+                    efi_mount_sources.append(dev["path"])
+                queue.extend(dev.get("children", []))
+
+        for src in efi_mount_sources:
+            if src not in seen_paths:
                 seen_paths.add(src)
                 efi_partitions.append({"path": src, "size": None, "fstype": "vfat"})
 
-        cmd = ["lsblk", "-J", "-o", "PATH,FSTYPE,PARTTYPE,SIZE"]
-        ok, _, stdout = backend._run_command(cmd, "List block devices for EFI", timeout=10)
-        if not ok:
-            raise RuntimeError("lsblk failed")
-        lsblk_data = json.loads(stdout or "{}")
-
-        def scan_device(device):
+        # Depth-first, parents before children, same order as lsblk prints them
+        stack = list(reversed(lsblk_data.get("blockdevices", [])))
+        while stack:
+            device = stack.pop()
             path = device.get("path")
-            fstype = device.get("fstype")
-            parttype = (device.get("parttype") or "").lower()
-            size = device.get("size")
             if not path or path in seen_paths:
-                return
-            # EFI GUID (case-insensitive); also accept vfat first partition on GPT
-            is_efi = (
-                fstype == "vfat" and parttype == efi_guid
-            ) or (
-                fstype == "vfat" and "efi" in (path or "").lower()
-            )
-            if is_efi:
-                seen_paths.add(path)
-                efi_partitions.append({"path": path, "size": size, "fstype": fstype or "vfat"})
-            for child in device.get("children", []):
-                scan_device(child)
-
-        for device in lsblk_data.get("blockdevices", []):
-            scan_device(device)
+                continue
+            fstype = device.get("fstype")
+            if fstype == "vfat":
+                # EFI GUID (case-insensitive); also accept vfat first partition on GPT
+                parttype = device.get("parttype")
+                if (parttype is not None and parttype.lower() == EFI_PARTTYPE_GUID) or "efi" in path.lower():
+                    seen_paths.add(path)
+                    efi_partitions.append({"path": path, "size": device.get("size"), "fstype": fstype})
+            stack.extend(reversed(device.get("children", ())))
     except Exception as e:
-        print(f"Warning: Failed to detect EFI partitions: {e}")
+        log.warning("Failed to detect EFI partitions: %s", e)
     return efi_partitions
 
 class DiskPage(BaseConfigurationPage):
@@ -287,7 +429,8 @@ class DiskPage(BaseConfigurationPage):
         
         # State variables
         self.detected_disks = []
-        self.selected_disks = set()
+        self.disks_by_path = {}  # detected_disks keyed by device path
+        self.selected_disk = None  # only one target disk at a time
         self.scan_completed = False
         self.partitioning_method = None
         self.filesystem_type = "btrfs"
@@ -298,7 +441,12 @@ class DiskPage(BaseConfigurationPage):
         self.disk_widgets = {}
         self.disk_list_rows = []  # Track rows for proper cleanup on rescan
         self.efi_partitions = []
-        self.disks_with_free_space = set()
+        self.disks_with_free_space = frozenset()
+        self._lsblk_data = None  # lsblk JSON tree from the last scan, shared with the EFI probe
+        self._parent_disk_cache = {}  # device path -> physical disk, filled by find_physical_disk_for_path
+        self._efi_cache = None  # detect_existing_efi_partitions() result for the last scan
+        self._efi_row_pool = []  # (row, radio) pairs reused by _populate_efi_partitions
+        self._free_space_cache = None  # _get_disks_with_free_space() result for the last scan
         
         self._build_ui()
             
@@ -318,6 +466,10 @@ class DiskPage(BaseConfigurationPage):
         self.scan_button.add_css_class("suggested-action")
         self.scan_button.add_css_class("compact")
         self.scan_button.connect("clicked", self.scan_for_disks)
+        self.scan_spinner = Gtk.Spinner()
+        self.scan_spinner.set_valign(Gtk.Align.CENTER)
+        self.scan_spinner.set_visible(False)
+        scan_row.add_suffix(self.scan_spinner)
         scan_row.add_suffix(self.scan_button)
         info_group.add(scan_row)
 
@@ -425,17 +577,17 @@ class DiskPage(BaseConfigurationPage):
             
     def _get_disks_with_free_space(self):
         """Return set of disk paths that have unallocated space (for dual boot)."""
-        result = set()
-        for disk in self.detected_disks:
-            path = disk.get("path")
-            if path and not disk.get("is_live_os_disk") and disk_has_unallocated_space(path):
-                result.add(path)
-        return result
+        return get_disks_with_free_space(self.detected_disks)
 
     def _check_dual_boot_available(self):
         """Check if dual boot is possible: EFI partitions exist and at least one disk has unallocated space."""
-        self.efi_partitions = detect_existing_efi_partitions()
-        self.disks_with_free_space = self._get_disks_with_free_space()
+        # Both answers are fixed until the next scan; toggling the install mode reuses them
+        if self._efi_cache is None:
+            self._efi_cache = detect_existing_efi_partitions(self._lsblk_data)
+        if self._free_space_cache is None:
+            self._free_space_cache = self._get_disks_with_free_space()
+        self.efi_partitions = self._efi_cache
+        self.disks_with_free_space = self._free_space_cache
         if not self.efi_partitions:
             self.dual_boot_row.set_sensitive(False)
             self.dual_boot_row.set_subtitle("No existing EFI partitions found. Use clean installation.")
@@ -462,10 +614,12 @@ class DiskPage(BaseConfigurationPage):
             self.preserve_efi = False
             self.efi_group.set_visible(False)
             for disk_path, widget_info in self.disk_widgets.items():
-                disk = next((d for d in self.detected_disks if d["path"] == disk_path), None)
+                disk = self.disks_by_path.get(disk_path)
                 if disk and not disk.get("is_live_os_disk"):
                     widget_info["row"].set_sensitive(True)
                     widget_info["row"].set_subtitle(format_bytes(disk.get("size")))
+                    if widget_info["radio"] is None:  # sole usable disk: nothing else to pick
+                        self.selected_disk = disk_path
             print("Installation mode: Normal (clean installation)")
         elif mode == "dual_boot":
             self.dual_boot_enabled = True
@@ -502,7 +656,7 @@ class DiskPage(BaseConfigurationPage):
         """When dual boot is selected, only enable disks with free space; clear invalid selection."""
         for disk_path, widget_info in self.disk_widgets.items():
             row, radio = widget_info["row"], widget_info["radio"]
-            disk = next((d for d in self.detected_disks if d["path"] == disk_path), None)
+            disk = self.disks_by_path.get(disk_path)
             size_str = format_bytes(disk["size"]) if disk else "N/A"
             if disk_path in self.disks_with_free_space:
                 row.set_sensitive(True)
@@ -510,15 +664,18 @@ class DiskPage(BaseConfigurationPage):
             else:
                 row.set_sensitive(False)
                 row.set_subtitle(f"{size_str} — no free space (shrink a partition first)")
-                if radio.get_active():
+                if radio is not None and radio.get_active():
                     radio.set_active(False)
-                    self.selected_disks.discard(disk_path)
-        if not self.selected_disks and self.disks_with_free_space:
-            first_valid = next(iter(self.disks_with_free_space))
+                if self.selected_disk == disk_path:
+                    self.selected_disk = None
+        if not self.selected_disk and self.disks_with_free_space:
+            # First qualifying disk in scan order, not whatever the set yields first
+            first_valid = next(d["path"] for d in self.detected_disks if d["path"] in self.disks_with_free_space)
             w = self.disk_widgets.get(first_valid)
             if w:
-                w["radio"].set_active(True)
-                self.selected_disks.add(first_valid)
+                if w["radio"] is not None:
+                    w["radio"].set_active(True)
+                self.selected_disk = first_valid
             self.show_toast("Select a disk with free space for dual boot")
 
     def on_efi_partition_selected(self, button, partition_path):
@@ -533,159 +690,183 @@ class DiskPage(BaseConfigurationPage):
                 self.preserve_efi = False
         self.update_complete_button_state()
     
-    def _populate_efi_partitions(self):
-        """Populate the EFI partition selection UI."""
-        # Clear existing rows
-        # In GTK 4, we need to remove rows differently
-        for widget in list(self.efi_group):
-            self.efi_group.remove(widget)
-        
-        efi_radio_group = None
-        for i, efi_part in enumerate(self.efi_partitions):
-            path = efi_part["path"]
-            size_str = format_bytes(efi_part["size"]) if efi_part["size"] else "Unknown"
-            
-            row = Adw.ActionRow(
-                title=f"EFI Partition: {path}",
-                subtitle=f"Size: {size_str}, Type: {efi_part['fstype']}"
-            )
-            
-            radio = Gtk.CheckButton() if i == 0 else Gtk.CheckButton(group=efi_radio_group)
-            if i == 0:
-                efi_radio_group = radio
-                radio.set_active(True)  # Select first by default
-                self.selected_efi_partition = path
-                self.preserve_efi = True
-            
+    def _on_efi_pool_row_toggled(self, button, index):
+        """Map a pooled EFI row's toggle back to the partition it currently shows."""
+        if index < len(self.efi_partitions):
+            self.on_efi_partition_selected(button, self.efi_partitions[index]["path"])
+
+    def _grow_efi_row_pool(self, count):
+        """Create EFI rows until the pool holds at least ``count`` of them."""
+        pool = self._efi_row_pool
+        while len(pool) < count:
+            index = len(pool)
+            row = Adw.ActionRow()
+            radio = Gtk.CheckButton() if not pool else Gtk.CheckButton(group=pool[0][1])
             radio.set_valign(Gtk.Align.CENTER)
-            radio.connect("toggled", self.on_efi_partition_selected, path)
+            radio.connect("toggled", self._on_efi_pool_row_toggled, index)
             row.add_suffix(radio)
             row.set_activatable_widget(radio)
+            row.set_visible(False)
             self.efi_group.add(row)
+            pool.append((row, radio))
 
-    def find_physical_disk_for_path(self, target_path, block_devices):
-        """Traces a given path back to its parent physical disk using lsblk data, handling loop devices."""
-        print(f"--- Tracing physical disk for path: {target_path} ---")
-        if not block_devices or not target_path:
-            print("  Error: Missing block_devices or target_path.")
-            return None
+    def _populate_efi_partitions(self):
+        """Populate the EFI partition selection UI."""
+        # Rows are created once and reused; each call only relabels them and
+        # hides whatever the current partition list doesn't need.
+        self._grow_efi_row_pool(max(len(self.efi_partitions), 4))
 
-        # Create a mapping from any path to its device info and parent path (pkname)
-        path_map = {}
-        queue = list(block_devices)
-        while queue:
-            dev = queue.pop(0)
-            dev_path = dev.get("path")
-            if dev_path:
-                path_map[dev_path] = {"info": dev, "pkname": dev.get("pkname")}
-            if "children" in dev:
-                queue.extend(dev["children"])
+        for efi_part, (row, radio) in zip(self.efi_partitions, self._efi_row_pool):
+            size_str = format_bytes(efi_part["size"]) if efi_part["size"] else "Unknown"
+            row.set_title(f"EFI Partition: {efi_part['path']}")
+            row.set_subtitle(f"Size: {size_str}, Type: {efi_part['fstype']}")
+            row.set_visible(True)
+        for row, _radio in self._efi_row_pool[len(self.efi_partitions):]:
+            row.set_visible(False)
+
+        if self.efi_partitions:
+            # Select first by default
+            self._efi_row_pool[0][1].set_active(True)
+            self.selected_efi_partition = self.efi_partitions[0]["path"]
+            self.preserve_efi = True
+
+    def find_physical_disk_for_path(self, target_path, path_map, loop_map=None, host_mounts=None):
+        """Traces a given path back to its parent physical disk using lsblk data, handling loop devices.
+        path_map is the first half of _build_path_map()'s result for the scanned lsblk tree.
+        loop_map / host_mounts may be passed in when already fetched; otherwise they are
+        fetched on first need."""
+        log.debug("--- Tracing physical disk for path: %s ---", target_path)
+        if not path_map or not target_path:
+            log.error("Missing path_map or target_path.")
+            return None
 
         # Trace upwards from the target_path
         current_path = target_path
-        visited = set() # Prevent infinite loops
-
-        while current_path and current_path not in visited:
-            visited.add(current_path)
-            print(f"  Tracing: current_path = {current_path}")
+        # Canonical (realpath) names seen so far: /dev/mapper/vg-lv and /dev/dm-3 are one device,
+        # so a cycle through both spellings is caught on its first repeat
+        visited = set()
+        canonical_index = None  # realpath -> lsblk path, built on the first path lsblk didn't list
+
+        while current_path:
+            canonical_path = os.path.realpath(current_path)
+            if canonical_path in visited:
+                log.error("Loop detected while tracing parent for %s", target_path)
+                return None
+            cached_disk = self._parent_disk_cache.get(canonical_path)
+            if cached_disk:
+                log.debug("Tracing: %s -> %s (cached)", current_path, cached_disk)
+                return self._remember_parent_disk(visited, cached_disk)
+            visited.add(canonical_path)
+            if current_path not in path_map:
+                # e.g. /dev/dm-3 from sysfs/dmsetup where lsblk -p printed /dev/mapper/vg-lv
+                if canonical_index is None:
+                    canonical_index = {os.path.realpath(p): p for p in path_map}
+                current_path = canonical_index.get(canonical_path, current_path)
+            log.debug("Tracing: current_path = %s", current_path)
 
             # --- Handle Loop Device ---
             if current_path.startswith("/dev/loop"):
-                print(f"  Path {current_path} is a loop device. Finding backing file...")
+                log.debug("Path %s is a loop device. Finding backing file...", current_path)
                 try:
-                    # Get Backing File path
-                    cmd_losetup = ["losetup", "-O", "BACK-FILE", "--noheadings", current_path]
-                    result_losetup = subprocess.run(cmd_losetup, capture_output=True, text=True, check=True, timeout=5)
-                    backing_file = result_losetup.stdout.strip()
-                    print(f"    Loop device {current_path} backing file: {backing_file}")
+                    # Get Backing File path (one losetup -J for every loop device on the trace)
+                    if loop_map is None:
+                        loop_map = get_loop_backing_files()
+                    backing_file = loop_map.get(current_path) or ""
+                    log.debug("Loop device %s backing file: %s", current_path, backing_file)
 
                     if backing_file and backing_file != "(deleted)": # Cannot trace deleted backing files reliably yet
                         backing_file_dir = os.path.dirname(backing_file)
-                        print(f"    Finding mountpoint containing backing file directory: {backing_file_dir}...")
+                        log.debug("Finding mountpoint containing backing file directory: %s...", backing_file_dir)
 
-                        # Use findmnt to find the source device for the directory containing the backing file
-                        # findmnt -n -o SOURCE --target /path/to/dir
-                        cmd_findmnt_src = ["findmnt", "-n", "-o", "SOURCE", "--target", backing_file_dir]
-                        result_findmnt_src = subprocess.run(cmd_findmnt_src, capture_output=True, text=True, check=True, timeout=5)
-                        source_device = result_findmnt_src.stdout.strip()
+                        # Source device of the mount containing the backing file directory
+                        # (what findmnt -n -o SOURCE --target /path/to/dir prints), from one findmnt -J
+                        if host_mounts is None:
+                            host_mounts = get_host_mounts()
+                        source_device = get_mount_source_for_path(backing_file_dir, host_mounts)
 
                         if source_device:
-                            print(f"    Backing file directory {backing_file_dir} is on source device: {source_device}")
+                            log.debug("Backing file directory %s is on source device: %s", backing_file_dir, source_device)
                             current_path = source_device # Continue tracing from the source device
                             continue # Restart loop with the new source device path
                         else:
-                            print(f"    ERROR: Could not find source device for backing file directory {backing_file_dir}")
+                            log.error("Could not find source device for backing file directory %s", backing_file_dir)
 
-                    print(f"    Trying lsblk parent (pkname) for loop device {current_path}...")
+                    log.debug("Trying lsblk parent (pkname) for loop device %s...", current_path)
                     if current_path in path_map:
                          parent_path = path_map[current_path]["pkname"]
                          if parent_path:
-                              print(f"    Found lsblk parent (pkname): {parent_path}. Continuing trace from parent.")
+                              log.debug("Found lsblk parent (pkname): %s. Continuing trace from parent.", parent_path)
                               current_path = parent_path
                               continue # Restart loop with the parent device path
                          else:
-                              print(f"    ERROR: Loop device {current_path} has no pkname in lsblk.")
+                              log.error("Loop device %s has no pkname in lsblk.", current_path)
                               return None
                     else:
                          # Should not happen if map was built correctly
-                         print(f"    ERROR: Loop device {current_path} not found in path_map for pkname lookup.")
+                         log.error("Loop device %s not found in path_map for pkname lookup.", current_path)
                          return None
 
                 except subprocess.CalledProcessError as e:
-                     print(f"  ERROR: Command failed while processing loop device {current_path}: {' '.join(e.cmd)}")
-                     print(f"  Stderr: {e.stderr}")
-                     print(f"  Continuing trace without resolving loop device further...") # Try to continue if command fails
+                     log.error("Command failed while processing loop device %s: %s", current_path, ' '.join(e.cmd))
+                     log.debug("Continuing trace without resolving loop device further...") # Try to continue if command fails
                      # Let it fall through to the general path/pkname check below
                 except Exception as e:
-                    print(f"  ERROR: Failed to process loop device {current_path}: {e}")
+                    log.error("Failed to process loop device %s: %s", current_path, e)
                     return None # Critical error if something else goes wrong
             # --- End Handle Loop Device ---
 
             # --- Handle Device Mapper ---
             elif current_path.startswith("/dev/mapper/"):
-                 print(f"  Path {current_path} is a device mapper device. Checking lsblk parent (pkname)...")
+                 log.debug("Path %s is a device mapper device. Checking lsblk parent (pkname)...", current_path)
                  parent_path = path_map.get(current_path, {}).get("pkname")
 
                  if parent_path:
-                      print(f"    Found lsblk parent (pkname): {parent_path}. Continuing trace from parent.")
+                      log.debug("Found lsblk parent (pkname): %s. Continuing trace from parent.", parent_path)
                       current_path = parent_path
                       continue # Restart loop with parent path
                  else:
-                      print(f"    Warning: Device mapper path {current_path} has no pkname in lsblk. Trying dmsetup...")
-                      try:
-                           cmd_dmsetup = ["dmsetup", "deps", "-o", "devname", current_path]
-                           result_dmsetup = subprocess.run(cmd_dmsetup, capture_output=True, text=True, check=True, timeout=5)
-                           # Output format: " device_name (major:minor)\n ..."
-                           # We want the first device_name
-                           deps_output = result_dmsetup.stdout.strip()
-                           match = re.search(r"^\s*(\S+)", deps_output) # Find first non-whitespace sequence
-                           if match:
-                                underlying_dev = match.group(1)
-                                # Ensure it's a device path
-                                if underlying_dev.startswith("/dev/"):
-                                     print(f"    Found underlying device via dmsetup: {underlying_dev}. Continuing trace.")
-                                     current_path = underlying_dev
-                                     continue # Restart loop with the underlying device
+                      log.warning("Device mapper path %s has no pkname in lsblk. Checking sysfs slaves...", current_path)
+                      slave_dev = _dm_slave_device(current_path)
+                      if slave_dev:
+                           log.debug("Found underlying device via sysfs: %s. Continuing trace.", slave_dev)
+                           current_path = slave_dev
+                           continue # Restart loop with the underlying device
+                      if slave_dev is None:
+                           log.warning("No sysfs slaves for %s. Trying dmsetup...", current_path)
+                           try:
+                                cmd_dmsetup = ["dmsetup", "deps", "-o", "devname", current_path]
+                                # stderr is captured (unlike the other probes) for the "dmsetup failed" error below
+                                result_dmsetup = subprocess.run(cmd_dmsetup, stdin=subprocess.DEVNULL, capture_output=True, text=True, check=True, timeout=5)
+                                # Output format: " device_name (major:minor)\n ..."
+                                # We want the first device_name
+                                deps_output = result_dmsetup.stdout.strip()
+                                underlying_dev = deps_output.split(None, 1)[0] if deps_output else None
+                                if underlying_dev:
+                                     # Ensure it's a device path
+                                     if underlying_dev.startswith("/dev/"):
+                                          log.debug("Found underlying device via dmsetup: %s. Continuing trace.", underlying_dev)
+                                          current_path = underlying_dev
+                                          continue # Restart loop with the underlying device
+                                     else:
+                                          log.warning("dmsetup output '%s' doesn't look like a device path.", underlying_dev)
                                 else:
-                                     print(f"    Warning: dmsetup output '{underlying_dev}' doesn't look like a device path.")
-                           else:
-                                print(f"    Warning: Could not parse underlying device from dmsetup output: {deps_output}")
-                      except FileNotFoundError:
-                           print(f"    ERROR: dmsetup command not found. Cannot resolve DM dependency for {current_path}.")
-                           return None # Cannot proceed without dmsetup if pkname missing
-                      except subprocess.CalledProcessError as e:
-                           print(f"    ERROR: dmsetup failed for {current_path}: {e.stderr}")
-                           # Proceed to general check below? Might fail.
-                      except Exception as e:
-                           print(f"    ERROR: Unexpected error running dmsetup for {current_path}: {e}")
-                           # Proceed to general check below? Might fail.
-
-                      print(f"    Falling back to general check for {current_path} after dmsetup attempt.")
+                                     log.warning("Could not parse underlying device from dmsetup output: %s", deps_output)
+                           except FileNotFoundError:
+                                log.error("dmsetup command not found. Cannot resolve DM dependency for %s.", current_path)
+                                return None # Cannot proceed without dmsetup if pkname missing
+                           except subprocess.CalledProcessError as e:
+                                log.error("dmsetup failed for %s: %s", current_path, e.stderr)
+                                # Proceed to general check below? Might fail.
+                           except Exception as e:
+                                log.error("Unexpected error running dmsetup for %s: %s", current_path, e)
+                                # Proceed to general check below? Might fail.
+
+                      log.debug("Falling back to general check for %s after dmsetup attempt.", current_path)
                       # If dmsetup fails or doesn't find a usable path, proceed to general check below
 
             # --- General Path Check ---
             if current_path not in path_map:
-                print(f"  Error: Path {current_path} not found in lsblk map (needed for type/pkname check).")
+                log.error("Path %s not found in lsblk map (needed for type/pkname check).", current_path)
                 # It might have been resolved via dmsetup/losetup to a path not originally scanned
                 # If we can't find it now, we cannot determine if it's a 'disk' or find its parent.
                 return None
@@ -695,33 +876,45 @@ class DiskPage(BaseConfigurationPage):
             dev_type = dev_info.get("type")
 
             if dev_type == "disk":
-                print(f"  Found parent disk: {current_path}")
-                return current_path
+                log.debug("Found parent disk: %s", current_path)
+                return self._remember_parent_disk(visited, current_path)
 
             parent_path = path_map[current_path]["pkname"]
             if not parent_path:
-                 print(f"  Error: Path {current_path} (type: {dev_type}) has no parent (pkname).")
+                 log.error("Path %s (type: %s) has no parent (pkname).", current_path, dev_type)
                  # If it's a disk but type wasn't exactly 'disk', maybe return anyway?
                  if dev_type and "disk" in dev_type.lower():
-                      print(f"  Treating path {current_path} as disk based on type '{dev_type}'.")
-                      return current_path
+                      log.debug("Treating path %s as disk based on type '%s'.", current_path, dev_type)
+                      return self._remember_parent_disk(visited, current_path)
                  return None # Cannot trace further without parent
 
             current_path = parent_path
 
-        if current_path in visited: print(f"  Error: Loop detected while tracing parent for {target_path}")
-        else: print(f"  Error: Could not find parent disk for {target_path} (trace ended unexpectedly)")
+        log.error("Could not find parent disk for %s (trace ended unexpectedly)", target_path)
         return None
 
+    def _remember_parent_disk(self, visited, disk_path):
+        """Record disk_path as the trace result for every (canonical) path walked to reach it;
+        returns disk_path."""
+        for path in visited:
+            self._parent_disk_cache[path] = disk_path
+        self._parent_disk_cache[os.path.realpath(disk_path)] = disk_path
+        return disk_path
+
     def scan_for_disks(self, button):
         """Runs lsblk once, identifies the live OS disk, checks usage, and updates the UI."""
-        print("Scanning for disks using lsblk...")
+        log.info("Scanning for disks using lsblk...")
         button.set_sensitive(False)
         self.show_toast("Scanning for storage devices...")
         self.scan_completed = False
         self.partitioning_method = None
-        self.selected_disks = set()
+        self.selected_disk = None
         self.disk_widgets = {}
+        # Partition tables may have changed (e.g. shrunk in GParted) since the last scan
+        get_free_space_region.cache_clear()
+        self._efi_cache = None
+        self._free_space_cache = None
+        self._parent_disk_cache = {}
         
         # Clear previous UI state
         self.disk_list_group.set_visible(False)
@@ -734,90 +927,129 @@ class DiskPage(BaseConfigurationPage):
         self.normal_radio.set_active(False)
         self.dual_boot_radio.set_active(False)
 
+        # lsblk, the live-disk trace and the parted probes can take seconds; keep the window responsive
+        self.scan_spinner.set_visible(True)
+        self.scan_spinner.start()
+        threading.Thread(target=self._scan_worker, daemon=True).start()
+
+    def _scan_worker(self):
+        """Background half of scan_for_disks: runs lsblk, finds the live OS disk and builds the disk list.
+        Touches no widgets; the result dict is handed to _apply_scan_result on the main loop."""
+        result = {"disks": [], "lsblk_data": None, "error": None}
         try:
             # Run lsblk ONCE, get JSON tree, include MOUNTPOINT (use backend for sudo when not root)
-            cmd = ["lsblk", "-J", "-b", "-p", "-o", "NAME,PATH,SIZE,MODEL,TYPE,PKNAME,MOUNTPOINT,TRAN"]
-            print(f"Running: {' '.join(cmd)}")
+            # FSTYPE/PARTTYPE let the dual-boot EFI probe reuse this tree instead of running lsblk again
+            cmd = _LSBLK_SCAN_CMD
+            log.debug("Running: %s", ' '.join(cmd))
+            # Everything the live-disk search may need is independent of lsblk: probe it all at
+            # once so the scan takes as long as the slowest probe, not their sum. losetup/findmnt
+            # only matter for loop-backed roots (live ISO) but cost little when unused.
+            pool = ThreadPoolExecutor(max_workers=4)
+            root_disk_future = pool.submit(_find_root_disk)
+            loop_map_future = pool.submit(get_loop_backing_files)
+            host_mounts_future = pool.submit(get_host_mounts)
+            pool.shutdown(wait=False)
             ok, err, stdout = backend._run_command(cmd, "Scan block devices", timeout=10)
             if not ok:
                 raise subprocess.CalledProcessError(1, cmd, err or "")
-            lsblk_data = json.loads(stdout or "{}")
+            lsblk_data = _json_loads(stdout or "{}")
             
-            self.detected_disks = []
+            detected_disks = []
             all_block_devices = lsblk_data.get("blockdevices", [])
             live_os_disk_path = None
 
             # --- Find the physical disk hosting the live OS root ('/') ---
-            print("--- Searching for live OS root mountpoint ('/') ---")
-            root_source_path = None
-            queue = list(all_block_devices)
-            processed_for_root = set() # Avoid reprocessing children
-            while queue:
-                 dev = queue.pop(0)
-                 dev_path = dev.get("path")
-                 if not dev_path or dev_path in processed_for_root: continue
-                 processed_for_root.add(dev_path)
-
-                 # Check current device
-                 if dev.get("mountpoint") == "/":
-                      root_source_path = dev_path
-                      print(f"  Found root mountpoint '/' on device: {root_source_path}")
-                      break # Found it
-
-                 # Check children
-                 if "children" in dev:
-                      for child in dev["children"]:
-                            child_path = child.get("path")
-                            if child_path and child.get("mountpoint") == "/":
-                                 root_source_path = child_path
-                                 print(f"  Found root mountpoint '/' on child device: {root_source_path}")
-                                 break # Found it
-                            # Add grandchildren only if root not found yet
-                            if "children" in child and root_source_path is None:
-                                 queue.extend(child["children"])
-                 if root_source_path: break # Exit outer loop if found
-
-            if root_source_path:
-                 live_os_disk_path = self.find_physical_disk_for_path(root_source_path, all_block_devices)
+            log.debug("--- Searching for live OS root mountpoint ('/') ---")
+            path_map, mountpoint_index = _build_path_map(all_block_devices)
+            # A plain disk partition under '/' resolves straight from mountinfo + sysfs;
+            # overlay/device-mapper/loop roots (the usual live ISO) go through the lsblk trace
+            live_os_disk_path = root_disk_future.result()
+            root_source_path = mountpoint_index.get("/")
+            if live_os_disk_path:
+                 log.info("--- Identified Live OS physical disk from mountinfo: %s ---", live_os_disk_path)
+            elif root_source_path:
+                 log.debug("Found root mountpoint '/' on device: %s", root_source_path)
+                 try:
+                      loop_map = loop_map_future.result()
+                 except Exception:
+                      loop_map = None  # the trace retries losetup itself and logs the failure
+                 live_os_disk_path = self.find_physical_disk_for_path(
+                      root_source_path, path_map, loop_map=loop_map, host_mounts=host_mounts_future.result()
+                 )
                  if live_os_disk_path:
-                      print(f"--- Identified Live OS physical disk: {live_os_disk_path} ---")
+                      log.info("--- Identified Live OS physical disk: %s ---", live_os_disk_path)
                  else:
-                      print("--- WARNING: Could not trace root mountpoint source back to a physical disk! ---")
+                      log.warning("Could not trace root mountpoint source back to a physical disk!")
             else:
-                 print("--- WARNING: Could not find root mountpoint '/' in lsblk output! ---")
+                 log.warning("Could not find root mountpoint '/' in lsblk output!")
             # --- Finished searching for live OS disk ---
 
             # --- Process all detected physical disks ---
-            print("--- Processing detected disks ---")
+            log.debug("--- Processing detected disks ---")
             for device in all_block_devices:
-                # Skip optical, USB/portable drives
-                tran = (device.get("tran") or "").lower()
-                if tran == "usb":
-                    print(f"  Skipping USB/portable disk: {device.get('path')}")
+                # Cheapest checks first: non-disks, then USB/portable drives, then optical drives
+                if device.get("type") != "disk":
+                    continue
+                disk_path = device.get("path")
+                if not disk_path:
+                    continue
+                if (device.get("tran") or "").lower() == "usb":
+                    log.debug("Skipping USB/portable disk: %s", disk_path)
                     continue
-                if device.get("type") == "disk" and not any(s in (device.get("model") or "").upper() for s in ["CD", "DVD"]):
-                    disk_path = device.get("path")
-                    if not disk_path: continue
-
-                    # Mark disk as unusable only if it's the one hosting the live OS
-                    is_live_os_disk = (disk_path == live_os_disk_path)
-                    
-                    print(f"  Processing disk: {disk_path}, Is Live OS Disk? {is_live_os_disk}")
-
-                    disk_info = {
-                        "name": device.get("name") or "N/A",
-                        "path": disk_path,
-                        "size": device.get("size"),
-                        "model": (device.get("model") or "Unknown Model").strip(),
-                        "is_live_os_disk": is_live_os_disk # Changed flag name
-                    }
-                    self.detected_disks.append(disk_info)
-
-            print(f"Detected disks list: {self.detected_disks}")
+                model_upper = (device.get("model") or "").upper()
+                if any(token in model_upper for token in _OPTICAL_MODEL_TOKENS):
+                    continue
+
+                # Mark disk as unusable only if it's the one hosting the live OS
+                is_live_os_disk = (disk_path == live_os_disk_path)
+                
+                log.debug("Processing disk: %s, Is Live OS Disk? %s", disk_path, is_live_os_disk)
+
+                disk_info = {
+                    "name": device.get("name") or "N/A",
+                    "path": disk_path,
+                    "size": device.get("size"),
+                    "model": (device.get("model") or "Unknown Model").strip(),
+                    "is_live_os_disk": is_live_os_disk # Changed flag name
+                }
+                detected_disks.append(disk_info)
+
+            log.debug("Detected disks list: %s", detected_disks)
+            # Warm the per-disk parted cache here so the dual-boot check on the main loop is instant
+            get_disks_with_free_space(detected_disks)
+            result["lsblk_data"] = lsblk_data
+            result["disks"] = detected_disks
+        except FileNotFoundError:
+            log.error("lsblk command not found.")
+            result["error"] = "Error: lsblk command not found. Cannot scan disks."
+        except subprocess.CalledProcessError as e:
+            log.error("lsblk failed: %s", e)
+            log.error("Stderr: %s", e.stderr)
+            result["error"] = f"Error running lsblk: {e.stderr}"
+        except json.JSONDecodeError as e:
+            log.error("Failed to parse lsblk JSON output: %s", e)
+            result["error"] = "Error parsing disk information."
+        except subprocess.TimeoutExpired:
+            log.error("lsblk command timed out.")
+            result["error"] = "Disk scan timed out."
+        except Exception as e:
+            log.error("Unexpected error during disk scan: %s", e)
+            result["error"] = f"An unexpected error occurred during disk scan."
+        GLib.idle_add(self._apply_scan_result, result)
+
+    def _apply_scan_result(self, result):
+        """Main-loop half of scan_for_disks: the only place scan results reach the UI."""
+        try:
+            self._lsblk_data = result["lsblk_data"]
+            self.detected_disks = result["disks"]
+            self.disks_by_path = {d["path"]: d for d in self.detected_disks}
+            if result["error"]:
+                self.show_toast(result["error"])
+                return False
             self._populate_disk_list()
             self.scan_completed = True
             self.show_toast(f"Scan complete. Found {len(self.detected_disks)} disk(s).")
-            
+
             if self.detected_disks:
                 self.disk_list_group.set_visible(True)
                 self.mode_group.set_visible(True)
@@ -826,35 +1058,20 @@ class DiskPage(BaseConfigurationPage):
                 self.normal_radio.set_active(True)  # Default to normal install
             else:
                  self.show_toast("No suitable disks found for installation.")
-
-        except FileNotFoundError:
-            print("ERROR: lsblk command not found.")
-            self.show_toast("Error: lsblk command not found. Cannot scan disks.")
-        except subprocess.CalledProcessError as e:
-            print(f"ERROR: lsblk failed: {e}")
-            print(f"Stderr: {e.stderr}")
-            self.show_toast(f"Error running lsblk: {e.stderr}")
-        except json.JSONDecodeError as e:
-            print(f"ERROR: Failed to parse lsblk JSON output: {e}")
-            self.show_toast("Error parsing disk information.")
-        except subprocess.TimeoutExpired:
-            print("ERROR: lsblk command timed out.")
-            self.show_toast("Disk scan timed out.")
-        except Exception as e:
-            print(f"ERROR: Unexpected error during disk scan: {e}")
-            self.show_toast(f"An unexpected error occurred during disk scan.")
         finally:
             # Re-enable scan button regardless of outcome
-            button.set_sensitive(True)
+            self.scan_spinner.stop()
+            self.scan_spinner.set_visible(False)
+            self.scan_button.set_sensitive(True)
             self.update_complete_button_state()
-            
+        return False
+
     def _populate_disk_list(self):
         """Populate the disk list with detected disks."""
-        # Remove previously added rows (AdwPreferencesGroup iterates internal structure; we track our own)
-        for row in self.disk_list_rows:
-            row.unparent()
-        self.disk_list_rows = []
+        # Build every row off-tree first, then swap them in while the group is hidden,
+        # so the group is laid out once instead of once per removed/added row.
         self.disk_widgets = {}
+        rows = []
 
         if not self.detected_disks:
             row = Adw.ActionRow(
@@ -862,12 +1079,14 @@ class DiskPage(BaseConfigurationPage):
                 subtitle="Cannot proceed with installation."
             )
             row.set_activatable(False)
-            self.disk_list_group.add(row)
-            self.disk_list_rows.append(row)
+            rows.append(row)
+            self._swap_disk_list_rows(rows)
             return
 
         disk_radio_group = None
         found_usable_disk = False
+        # With a single usable disk there is no choice to make: show it without a radio button
+        single_usable = sum(1 for d in self.detected_disks if not d["is_live_os_disk"]) == 1
         
         for i, disk in enumerate(self.detected_disks):
             disk_path = disk["path"]
@@ -878,19 +1097,23 @@ class DiskPage(BaseConfigurationPage):
             row = Adw.ActionRow(title=title, subtitle=subtitle)
             
             if disk["is_live_os_disk"]:
-                 print(f"!!! UI Update: Marking {disk['path']} (Live OS Disk) as insensitive.")
+                 log.debug("!!! UI Update: Marking %s (Live OS Disk) as insensitive.", disk['path'])
                  row.set_subtitle(subtitle + " (Live OS Disk - Cannot select)")
                  row.set_sensitive(False)
                  warning_icon = Gtk.Image.new_from_icon_name("dialog-warning-symbolic")
                  warning_icon.set_tooltip_text("This disk contains the live operating system")
                  row.add_suffix(warning_icon)
+            elif single_usable:
+                 found_usable_disk = True
+                 self.selected_disk = disk_path
+                 self.disk_widgets[disk_path] = {"row": row, "radio": None}
             else:
                  found_usable_disk = True
                  radio = Gtk.CheckButton() if disk_radio_group is None else Gtk.CheckButton(group=disk_radio_group)
                  if disk_radio_group is None:
                      disk_radio_group = radio
                      radio.set_active(True)  # Select first usable disk by default
-                     self.selected_disks.add(disk_path)
+                     self.selected_disk = disk_path
                  
                  radio.set_valign(Gtk.Align.CENTER)
                  radio.connect("toggled", self.on_disk_toggled, disk_path)
@@ -898,52 +1121,64 @@ class DiskPage(BaseConfigurationPage):
                  row.set_activatable_widget(radio)
                  self.disk_widgets[disk_path] = {"row": row, "radio": radio}
 
-            self.disk_list_group.add(row)
-            self.disk_list_rows.append(row)
+            rows.append(row)
+
+        self._swap_disk_list_rows(rows)
             
         if not found_usable_disk:
-             print("Warning: No usable disks detected (only Live OS disk found?).")
+             log.warning("No usable disks detected (only Live OS disk found?).")
+
+    def _swap_disk_list_rows(self, rows):
+        """Replace the rows shown in disk_list_group with rows in a single hidden pass."""
+        was_visible = self.disk_list_group.get_visible()
+        self.disk_list_group.set_visible(False)
+        # Remove previously added rows (AdwPreferencesGroup iterates internal structure; we track our own)
+        for row in self.disk_list_rows:
+            self.disk_list_group.remove(row)
+        for row in rows:
+            self.disk_list_group.add(row)
+        self.disk_list_rows = rows
+        self.disk_list_group.set_visible(was_visible)
 
     def on_disk_toggled(self, radio_button, disk_path):
         """Handle disk selection toggle."""
-        print(f"--- Toggle event for {disk_path} ---")
+        log.debug("--- Toggle event for %s ---", disk_path)
         
         if radio_button.get_active():
-            print(f"  Adding {disk_path} to selected_disks.")
-            self.selected_disks.clear()  # Only one disk at a time for now
-            self.selected_disks.add(disk_path)
+            log.debug("Selecting %s.", disk_path)
+            self.selected_disk = disk_path
         
         self.update_complete_button_state()
 
     def update_complete_button_state(self):
         """Update the state of the complete button based on current selections."""
-        print(f"--- Updating button state ---")
-        print(f"  Selected disks: {self.selected_disks}")
-        print(f"  Partitioning method: {self.partitioning_method}")
+        log.debug("--- Updating button state ---")
+        log.debug("Selected disk: %s", self.selected_disk)
+        log.debug("Partitioning method: %s", self.partitioning_method)
         
-        selected_disk = next(iter(self.selected_disks), None) if self.selected_disks else None
+        selected_disk = self.selected_disk
         dual_boot_ok = (
             selected_disk in self.disks_with_free_space and
             self.selected_efi_partition is not None
         )
         can_proceed = (
             self.scan_completed and 
-            len(self.selected_disks) > 0 and 
+            selected_disk is not None and 
             self.partitioning_method is not None and
             (not self.dual_boot_enabled or dual_boot_ok)
         )
         
-        print(f"  Setting Complete button sensitive: {can_proceed}")
+        log.debug("Setting Complete button sensitive: %s", can_proceed)
         self.complete_button.set_sensitive(can_proceed)
         
     def apply_settings_and_return(self, button):
         """Apply the storage configuration and return to summary."""
-        print(f"--- Apply Settings START ---")
-        print(f"  Selected disks: {self.selected_disks}")
-        print(f"  Installation mode: {self.partitioning_method}")
-        print(f"  Filesystem: {self.filesystem_type}")
-        print(f"  Dual boot: {self.dual_boot_enabled}")
-        print(f"  Preserve EFI: {self.preserve_efi}")
+        log.debug("--- Apply Settings START ---")
+        log.debug("Selected disk: %s", self.selected_disk)
+        log.debug("Installation mode: %s", self.partitioning_method)
+        log.debug("Filesystem: %s", self.filesystem_type)
+        log.debug("Dual boot: %s", self.dual_boot_enabled)
+        log.debug("Preserve EFI: %s", self.preserve_efi)
         
         # Re-validate conditions before proceeding
         self.update_complete_button_state()
@@ -951,16 +1186,16 @@ class DiskPage(BaseConfigurationPage):
              self.show_toast("Please complete all required selections.")
              return
 
-        if not self.selected_disks:
+        if not self.selected_disk:
              self.show_toast("Please select a disk for installation.")
              return
 
-        primary_disk = sorted(list(self.selected_disks))[0]
+        primary_disk = self.selected_disk
         
         # Initialize config_values
         config_values = {
             "method": self.partitioning_method,
-            "target_disks": sorted(list(self.selected_disks)), 
+            "target_disks": [primary_disk],
             "filesystem": self.filesystem_type,
             "dual_boot": self.dual_boot_enabled,
             "preserve_efi": self.preserve_efi,
@@ -971,30 +1206,31 @@ class DiskPage(BaseConfigurationPage):
         }
 
         if self.partitioning_method in ["normal", "dual_boot"]:
-            print(f"  Generating partitioning commands for: {primary_disk}")
+            log.debug("Generating partitioning commands for: %s", primary_disk)
             
-            # Detect firmware type to decide partition layout
-            is_uefi = os.path.exists("/sys/firmware/efi")
+            # Firmware type decides the partition layout
+            is_uefi = _IS_UEFI
 
             # Get EFI size if custom formatting is enabled
             efi_size = int(self.efi_size_row.get_value()) if self.custom_format_enabled else 512
             
             # Generate the command lists
-            partition_prefix = "p" if "nvme" in primary_disk else ""
+            partition_prefix = partition_prefix_for(primary_disk)
             
-            print(f"=== DISK CONFIGURATION DEBUG ===")
-            print(f"Primary disk: {primary_disk}")
-            print(f"Partition prefix: '{partition_prefix}'")
-            print(f"EFI size: {efi_size} MB")
-            print(f"Filesystem: {self.filesystem_type}")
-            print(f"Dual boot: {self.dual_boot_enabled}")
-            print(f"Preserve EFI: {self.preserve_efi}")
-            print(f"=== GENERATING COMMANDS ===")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("=== DISK CONFIGURATION DEBUG ===")
+                log.debug("Primary disk: %s", primary_disk)
+                log.debug("Partition prefix: '%s'", partition_prefix)
+                log.debug("EFI size: %s MB", efi_size)
+                log.debug("Filesystem: %s", self.filesystem_type)
+                log.debug("Dual boot: %s", self.dual_boot_enabled)
+                log.debug("Preserve EFI: %s", self.preserve_efi)
+                log.debug("=== GENERATING COMMANDS ===")
             
             if not (self.dual_boot_enabled and self.preserve_efi):
                 wipe_cmd = generate_wipefs_command(primary_disk)
                 config_values["commands"].append(wipe_cmd)
-                print(f"Wipe command: {wipe_cmd}")
+                log.debug("Wipe command: %s", wipe_cmd)
             
             parted_cmds = generate_gpt_commands(
                 primary_disk,
@@ -1005,7 +1241,7 @@ class DiskPage(BaseConfigurationPage):
                 bios_mode=not is_uefi
             )
             config_values["commands"].extend(parted_cmds)
-            print(f"Parted commands: {parted_cmds}")
+            log.debug("Parted commands: %s", parted_cmds)
             
             include_efi = is_uefi and not (self.dual_boot_enabled and self.preserve_efi)
             root_part_override = None
@@ -1025,15 +1261,16 @@ class DiskPage(BaseConfigurationPage):
                 root_part_override=root_part_override
             )
             config_values["commands"].extend(mkfs_cmds)
-            print(f"Mkfs commands: {mkfs_cmds}")
+            log.debug("Mkfs commands: %s", mkfs_cmds)
             
             # Define partition layout
             part1_suffix = f"{partition_prefix}1"
             part2_suffix = f"{partition_prefix}2"
             
-            print(f"=== PARTITION LAYOUT ===")
-            print(f"Part1 suffix: '{part1_suffix}'")
-            print(f"Part2 suffix: '{part2_suffix}'")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("=== PARTITION LAYOUT ===")
+                log.debug("Part1 suffix: '%s'", part1_suffix)
+                log.debug("Part2 suffix: '%s'", part2_suffix)
             
             partitions = []
             if is_uefi:
@@ -1044,7 +1281,7 @@ class DiskPage(BaseConfigurationPage):
                         "mountpoint": "/boot/efi",
                         "fstype": "vfat"
                     })
-                    print(f"EFI partition: device={efi_device}, mountpoint=/boot/efi, fstype=vfat")
+                    log.debug("EFI partition: device=%s, mountpoint=/boot/efi, fstype=vfat", efi_device)
                     root_device = f"{primary_disk}{part2_suffix}"
                 elif self.selected_efi_partition:
                     partitions.append({
@@ -1052,7 +1289,7 @@ class DiskPage(BaseConfigurationPage):
                         "mountpoint": "/boot/efi",
                         "fstype": "vfat"
                     })
-                    print(f"Using existing EFI partition: device={self.selected_efi_partition}")
+                    log.debug("Using existing EFI partition: device=%s", self.selected_efi_partition)
                     root_device = root_part_override or f"{primary_disk}{partition_prefix}2"
                 else:
                     root_device = root_part_override or f"{primary_disk}{part2_suffix}"
@@ -1064,19 +1301,20 @@ class DiskPage(BaseConfigurationPage):
                 "mountpoint": "/", 
                 "fstype": self.filesystem_type
             })
-            print(f"Root partition: device={root_device}, mountpoint=/, fstype={self.filesystem_type}")
+            log.debug("Root partition: device=%s, mountpoint=/, fstype=%s", root_device, self.filesystem_type)
             
             config_values["partitions"] = partitions
             
-            print(f"=== FINAL COMMANDS LIST ===")
-            for i, cmd in enumerate(config_values["commands"]):
-                print(f"Command {i+1}: {' '.join(cmd)}")
-            print(f"=== END DISK CONFIGURATION DEBUG ===")
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("=== FINAL COMMANDS LIST ===")
+                for i, cmd in enumerate(config_values["commands"]):
+                    log.debug("Command %s: %s", i+1, ' '.join(cmd))
+                log.debug("=== END DISK CONFIGURATION DEBUG ===")
             
-            if config_values["commands"]:
-                 print(f"    Example command: {' '.join(shlex.quote(c) for c in config_values['commands'][0])}")
+            if config_values["commands"] and log.isEnabledFor(logging.DEBUG):
+                 log.debug("Example command: %s", ' '.join(shlex.quote(c) for c in config_values['commands'][0]))
 
-        print("Storage configuration confirmed. Returning to summary.")
+        log.info("Storage configuration confirmed. Returning to summary.")
         
         mode_text = "Dual boot" if self.dual_boot_enabled else "Clean installation"
         self.show_toast(f"{mode_text} on {primary_disk} with {self.filesystem_type} filesystem")
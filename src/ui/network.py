@@ -1,55 +1,101 @@
 # centrio_installer/ui/network.py
 
 import gi
-import subprocess
+import queue
 import threading
+import time
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
-from gi.repository import Gtk, Adw, GLib
+from gi.repository import Gtk, Adw, GLib, Gio
 
 from .base import BaseConfigurationPage
 
 
-def _detect_connection_type():
-    """Returns ('wired'|'wifi'|'none', connected: bool). Uses nmcli networking connectivity
-    for reliable connectivity; dev status alone can report 'connected' incorrectly."""
-    try:
-        r_conn = subprocess.run(
-            ["nmcli", "networking", "connectivity", "check"],
-            capture_output=True, text=True, timeout=5
-        )
-        actually_connected = False
-        if r_conn.returncode == 0 and r_conn.stdout:
-            out = r_conn.stdout.strip().lower()
-            actually_connected = out in ("full", "limited")
+_NM_BUS_NAME = "org.freedesktop.NetworkManager"
+_NM_OBJECT_PATH = "/org/freedesktop/NetworkManager"
+_NM_CONNECTIVITY_LIMITED = 3  # NMConnectivityState: 3 = limited, 4 = full
+_NM_ETHERNET_TYPES = ("802-3-ethernet", "ethernet")
+_NM_WIFI_TYPES = ("802-11-wireless", "wifi", "wireless")
+# Status row state -> (subtitle, icon name, CSS class for the icon)
+_STATUS_PRESENTATION = {
+    "wired": ("Connected via wired network", "network-wired-symbolic", "success"),
+    "wifi": ("Connected via Wi‑Fi", "network-wireless-symbolic", "success"),
+    "offline": ("No network connection", "network-offline-symbolic", "error"),
+}
+_CONNECTION_CACHE_TTL = 3.0  # seconds; re-entering the page shortly after reuses the answer
+_connection_cache = None  # (monotonic timestamp, (conn_type, connected))
+
+
+class _AdaptiveTimeout:
+    """Timeout in ms that starts short, doubles after each use up to cap, and resets on success."""
+
+    def __init__(self, base, cap):
+        self.base = self.current = base
+        self.cap = cap
+
+    def next(self):
+        value = self.current
+        self.current = min(self.cap, self.current * 2)
+        return value
 
+    def success(self):
+        self.current = self.base
+
+
+# NetworkManager normally answers GetAll in milliseconds; only a busy/starting daemon needs longer
+_nm_call_timeout = _AdaptiveTimeout(500, 8000)
+
+
+def _forget_connection_state():
+    """Drop the cached probe result so the next _detect_connection_type() asks NetworkManager."""
+    global _connection_cache
+    _connection_cache = None
+
+
+def _connection_from_nm_properties(props):
+    """Map NetworkManager's Connectivity / PrimaryConnectionType properties to
+    ('wired'|'wifi'|'none', connected: bool)."""
+    connected = props.get("Connectivity", 0) >= _NM_CONNECTIVITY_LIMITED
+    primary_type = (props.get("PrimaryConnectionType") or "").lower()
+    if primary_type in _NM_ETHERNET_TYPES:
+        conn_type = "wired"
+    elif primary_type in _NM_WIFI_TYPES:
+        conn_type = "wifi"
+    else:
         conn_type = "none"
-        r_active = subprocess.run(
-            ["nmcli", "-t", "-f", "TYPE,DEVICE", "connection", "show", "--active"],
-            capture_output=True, text=True, timeout=5
-        )
-        if r_active.returncode == 0 and r_active.stdout.strip():
-            for line in r_active.stdout.strip().split("\n"):
-                parts = line.split(":", 1)
-                t = (parts[0] or "").lower()
-                if t == "loopback":
-                    continue
-                if t in ("802-3-ethernet", "ethernet"):
-                    conn_type = "wired"
-                    break
-                if t in ("wifi", "802-11-wireless", "wireless"):
-                    conn_type = "wifi"
-                    break
-
-        if conn_type == "none":
-            r_wifi = subprocess.run(
-                ["nmcli", "-t", "-f", "TYPE", "dev", "status"],
-                capture_output=True, text=True, timeout=3
-            )
-            if r_wifi.returncode == 0 and "wifi" in (r_wifi.stdout or "").lower():
-                conn_type = "wifi"
+    return conn_type, connected
+
 
-        return conn_type, actually_connected
+def _detect_connection_type():
+    """Returns ('wired'|'wifi'|'none', connected: bool). Reads NetworkManager's own
+    Connectivity state over D-Bus (one GetAll call); 'connected' device state alone
+    can be reported incorrectly. The answer is reused for a few seconds.
+    Raises TimeoutError if NetworkManager didn't answer twice in a row."""
+    global _connection_cache
+    now = time.monotonic()
+    if _connection_cache and now - _connection_cache[0] < _CONNECTION_CACHE_TTL:
+        return _connection_cache[1]
+    try:
+        bus = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+        for attempt in range(2):
+            try:
+                reply = bus.call_sync(
+                    _NM_BUS_NAME, _NM_OBJECT_PATH, "org.freedesktop.DBus.Properties", "GetAll",
+                    GLib.Variant("(s)", (_NM_BUS_NAME,)), GLib.VariantType("(a{sv})"),
+                    Gio.DBusCallFlags.NONE, _nm_call_timeout.next(), None
+                )
+                break
+            except GLib.Error as e:
+                if not e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.TIMED_OUT):
+                    raise
+                if attempt:
+                    raise TimeoutError("NetworkManager did not respond") from None
+        _nm_call_timeout.success()
+        result = _connection_from_nm_properties(reply.unpack()[0])
+        _connection_cache = (now, result)
+        return result
+    except TimeoutError:
+        raise
     except Exception:
         return "none", False
 
@@ -69,14 +115,32 @@ class NetworkConnectivityPage(BaseConfigurationPage):
         self.skip_network = False
         self.network_status = "unknown"
         self.connection_type = "none"
+        # Only one probe runs at a time; changes reported meanwhile fold into one follow-up probe
+        self._check_running = False
+        self._recheck_pending = False
+        self._shown_state = None  # _STATUS_PRESENTATION key currently on screen
+        self._work_q = None  # probes for the background worker, started on first use
+        self._initial_check_done = False
         self._build_ui()
-        self._check_network_status()
+        # Probe (and start following NetworkManager) only once the page is actually shown
+        self.connect("map", self._on_map)
+
+    def _on_map(self, *_args):
+        if not self._initial_check_done:
+            self._initial_check_done = True
+            self._check_network_status()
+            self._watch_network_manager()
 
     def _build_ui(self):
         self.status_section = Adw.PreferencesGroup(title="Network Status", description="Current connectivity")
         self.add(self.status_section)
         self.status_row = Adw.ActionRow(title="Status", subtitle="Checking...")
-        self.status_icon = Gtk.Image.new_from_icon_name("network-wireless-symbolic")
+        # One GIcon per status look, built once and handed to the image as-is on every change
+        self._status_gicons = {
+            state: Gio.ThemedIcon.new(icon_name)
+            for state, (_subtitle, icon_name, _css) in _STATUS_PRESENTATION.items()
+        }
+        self.status_icon = Gtk.Image.new_from_gicon(self._status_gicons["wifi"])
         self.status_row.add_prefix(self.status_icon)
         self.status_section.add(self.status_row)
 
@@ -111,30 +175,85 @@ class NetworkConnectivityPage(BaseConfigurationPage):
         self.buttons_section.add(self.skip_row)
 
     def _check_network_status(self):
+        if self._check_running:
+            self._recheck_pending = True
+            return
+        self._check_running = True
+
         def check():
-            conn_type, connected = _detect_connection_type()
-            self.connection_type = conn_type
-            self.network_status = "connected" if connected else "disconnected"
-            self.network_enabled = connected
-            GLib.idle_add(self._update_ui)
+            # Worker thread: probe only; page state and widgets are updated on the main loop
+            try:
+                conn_type, connected = _detect_connection_type()
+            except TimeoutError:
+                GLib.idle_add(self._finish_network_check, "none", False, True)
+                return
+            GLib.idle_add(self._finish_network_check, conn_type, connected)
+
+        self._submit_work(check)
+
+    def _submit_work(self, fn):
+        """Run fn on the page's single long-lived worker thread (created on first use)."""
+        if self._work_q is None:
+            self._work_q = queue.Queue()
+            threading.Thread(target=self._work_loop, args=(self._work_q,), daemon=True).start()
+        self._work_q.put(fn)
+
+    @staticmethod
+    def _work_loop(work_q):
+        while True:
+            fn = work_q.get()
+            try:
+                fn()
+            except Exception as e:
+                print(f"Warning: network page background task failed: {e}")
+
+    def _finish_network_check(self, conn_type, connected, timed_out=False):
+        self._check_running = False
+        if timed_out:
+            self.show_toast("NetworkManager is not responding; showing the network as offline.")
+        self.connection_type = conn_type
+        self.network_status = "connected" if connected else "disconnected"
+        self.network_enabled = connected
+        self._update_ui()
+        if self._recheck_pending:
+            # NetworkManager changed state while the last probe was running
+            self._recheck_pending = False
+            _forget_connection_state()
+            self._check_network_status()
+        return GLib.SOURCE_REMOVE
+
+    def _watch_network_manager(self):
+        """Re-check whenever NetworkManager's connectivity or primary connection changes,
+        e.g. after the user joins a Wi-Fi network from the control center."""
+        try:
+            bus = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+            bus.signal_subscribe(
+                _NM_BUS_NAME, "org.freedesktop.DBus.Properties", "PropertiesChanged",
+                _NM_OBJECT_PATH, _NM_BUS_NAME, Gio.DBusSignalFlags.NONE,
+                self._on_nm_properties_changed
+            )
+        except Exception as e:
+            print(f"Warning: Could not watch NetworkManager for changes: {e}")
 
-        threading.Thread(target=check, daemon=True).start()
+    def _on_nm_properties_changed(self, connection, sender, path, interface, signal, params):
+        changed = params.unpack()[1]
+        if "Connectivity" in changed or "PrimaryConnectionType" in changed:
+            _forget_connection_state()
+            self._check_network_status()
 
     def _update_ui(self):
-        if self.network_status == "connected":
-            if self.connection_type == "wired":
-                self.status_row.set_subtitle("Connected via wired network")
-                self.status_icon.set_from_icon_name("network-wired-symbolic")
-            else:
-                self.status_row.set_subtitle("Connected via Wi‑Fi")
-                self.status_icon.set_from_icon_name("network-wireless-symbolic")
-            self.status_icon.add_css_class("success")
-            self.apply_btn.set_sensitive(True)
+        if self.network_status != "connected":
+            state = "offline"
         else:
-            self.status_row.set_subtitle("No network connection")
-            self.status_icon.set_from_icon_name("network-offline-symbolic")
-            self.status_icon.add_css_class("error")
-            self.apply_btn.set_sensitive(False)
+            state = "wired" if self.connection_type == "wired" else "wifi"
+        if state != self._shown_state:
+            self._shown_state = state
+            subtitle, _icon_name, css_class = _STATUS_PRESENTATION[state]
+            self.status_row.set_subtitle(subtitle)
+            self.status_icon.set_from_gicon(self._status_gicons[state])
+            # Replace the whole class list so success/error never pile up across changes
+            self.status_icon.set_css_classes([css_class])
+            self.apply_btn.set_sensitive(state != "offline")
         self.skip_btn.set_sensitive(True)
 
     def _on_apply(self, btn):
@@ -1,30 +1,64 @@
 # centrio_installer/ui/payload.py
 
 import os
-import subprocess
+import glob
+import logging
+import threading
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
 import gi
 from utils import get_host_architecture
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
-from gi.repository import Gtk, Adw, GLib
+from gi.repository import Gtk, Adw, GLib, Gio
 
 from .base import BaseConfigurationPage
 
-_ICONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'icons')
+log = logging.getLogger(__name__)
 
+# Entry rows are parsed once typing pauses for this long (ms)
+_ENTRY_DEBOUNCE_MS = 200
 
+_ICONS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'icons'))
+# One directory listing at import instead of a stat() per icon per page
+_AVAILABLE_ICONS = frozenset(os.listdir(_ICONS_DIR)) if os.path.isdir(_ICONS_DIR) else frozenset()
+
+
+@lru_cache(maxsize=1)
 def _detect_nvidia_gpu():
-    """Return True if an NVIDIA GPU is detected via lspci (no drivers required)."""
-    try:
-        r = subprocess.run(
-            ["lspci", "-n"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        return r.returncode == 0 and "10de:" in r.stdout  # NVIDIA PCI vendor ID
-    except Exception:
-        return False
+    """Return True if an NVIDIA GPU is present (no drivers required).
+
+    Reads the PCI vendor IDs straight from sysfs instead of running lspci.
+    Hardware does not change during an installer session, so the result is
+    cached for every later PayloadPage.
+    """
+    for vendor_path in glob.glob("/sys/bus/pci/devices/*/vendor"):
+        try:
+            with open(vendor_path, "r") as f:
+                if f.read().strip() == "0x10de":  # NVIDIA PCI vendor ID
+                    return True
+        except OSError:
+            continue
+    return False
+
+def _set_sensitive(widget, value):
+    """set_sensitive() only when it changes, to skip the notify and style recompute."""
+    if widget.get_sensitive() != value:
+        widget.set_sensitive(value)
+
+
+def _set_active(widget, value):
+    """set_active() only when it changes, so no toggled/notify handler re-runs."""
+    if widget.get_active() != value:
+        widget.set_active(value)
+
+
+@lru_cache(maxsize=None)
+def _themed_gicon(icon_name):
+    """Shared, immutable GIcon for a themed icon name (one per name per process)."""
+    return Gio.ThemedIcon.new(icon_name)
+
 
 def _get_core_packages():
     """Arch-aware core package list."""
@@ -34,7 +68,8 @@ def _get_core_packages():
         pkgs.insert(pkgs.index(arch["grub_efi_modules_pkg"]) + 1, "grub2-pc")
     return pkgs
 
-# Default package groups and packages
+# Default package groups and packages. Read-only templates: each PayloadPage
+# takes its own copy of the per-group dicts before toggling "selected".
 DEFAULT_PACKAGE_GROUPS = {
     "core": {
         "name": "Core System",
@@ -80,8 +115,14 @@ DEFAULT_PACKAGE_GROUPS = {
         "selected": False
     }
 }
+DEFAULT_PACKAGE_GROUPS = MappingProxyType(
+    {gid: MappingProxyType(info) for gid, info in DEFAULT_PACKAGE_GROUPS.items()}
+)
+# Per-group DNF / Flatpak package tuples, flattened once at import
+_GROUP_DNF = {gid: tuple(info.get("packages", ())) for gid, info in DEFAULT_PACKAGE_GROUPS.items()}
+_GROUP_FLATPAK = {gid: tuple(info.get("flatpak_packages", ())) for gid, info in DEFAULT_PACKAGE_GROUPS.items()}
 
-# Common custom repositories
+# Common custom repositories (read-only templates, see above)
 COMMON_REPOSITORIES = {
     "rpmfusion-free": {
         "name": "RPM Fusion Free",
@@ -96,6 +137,27 @@ COMMON_REPOSITORIES = {
         "enabled": False
     },
 }
+COMMON_REPOSITORIES = MappingProxyType(
+    {rid: MappingProxyType(info) for rid, info in COMMON_REPOSITORIES.items()}
+)
+
+# Web browsers offered on the software page (all Flatpak)
+_BROWSERS = (
+    ("firefox", "Firefox", "org.mozilla.firefox", "firefox.svg"),
+    ("chrome", "Chrome", "com.google.Chrome", "chrome.svg"),
+    ("brave", "Brave", "com.brave.Browser", "brave.svg"),
+    ("edge", "Edge", "com.microsoft.Edge", "edge.svg"),
+    ("none", "No web browser", None, None),
+)
+BROWSER_OPTIONS = MappingProxyType({
+    bid: MappingProxyType({
+        "name": name,
+        "flatpak": flatpak,
+        "icon_file": icon_file,
+        "icon_path": os.path.join(_ICONS_DIR, icon_file) if icon_file else None,
+    })
+    for bid, name, flatpak, icon_file in _BROWSERS
+})
 
 class PayloadPage(BaseConfigurationPage):
     """Enhanced page for package selection and software configuration."""
@@ -109,18 +171,36 @@ class PayloadPage(BaseConfigurationPage):
         )
         
         # State variables
-        self.package_groups = DEFAULT_PACKAGE_GROUPS.copy()
+        self.package_groups = {gid: dict(info) for gid, info in DEFAULT_PACKAGE_GROUPS.items()}
         self.package_group_rows = {}
-        self.custom_repositories = COMMON_REPOSITORIES.copy()
+        self.custom_repositories = {rid: dict(info) for rid, info in COMMON_REPOSITORIES.items()}
         self.flatpak_enabled = True
-        self.nvidia_drivers = _detect_nvidia_gpu()
+        self.nvidia_drivers = False  # Filled in by _detect_nvidia_worker once the UI is up
         self.server_install = False  # False=Desktop, True=Server
         self.custom_packages = []
         self.oem_packages = []
         self.oem_repo_url = ""
         
         self.network_warning_row = None
+        self._browser_icons_loaded = False
+        self._pending_oem_repo_id = 0
+        self._pending_custom_id = 0
+        self._suppress_flatpak_handler = False
+        self._suppress_browser_handler = False
+        self._last_has_network = None  # has_network last applied by refresh_for_network
         self._build_ui()
+        threading.Thread(target=self._detect_nvidia_worker, daemon=True).start()
+
+    def _detect_nvidia_worker(self):
+        """Probe for an NVIDIA GPU off the main loop and post the default back."""
+        detected = _detect_nvidia_gpu()
+        if detected:
+            GLib.idle_add(self._apply_nvidia_default, detected)
+
+    def _apply_nvidia_default(self, detected):
+        self.nvidia_drivers = detected
+        self.nvidia_row.set_active(detected)
+        return GLib.SOURCE_REMOVE
 
     def refresh_for_network(self, network_config=None):
         """Gray out network-dependent options when no network. Call when page is shown."""
@@ -128,18 +208,21 @@ class PayloadPage(BaseConfigurationPage):
         connected = net.get("network_status") == "connected"
         skip = net.get("skip_network", True)
         has_network = connected and not skip
+        if has_network == self._last_has_network:
+            return
         for w in [self.flatpak_row, self.flatpak_section, self.repos_section, self.oem_section, self.oem_repo_row, self.custom_packages_row]:
-            w.set_sensitive(has_network)
+            _set_sensitive(w, has_network)
         if not has_network:
-            self.browser_section.set_sensitive(False)
+            _set_sensitive(self.browser_section, False)
         for gid, ginfo in self.package_groups.items():
             if not ginfo["required"] and gid in self.package_group_rows:
-                self.package_group_rows[gid].set_sensitive(has_network)
+                _set_sensitive(self.package_group_rows[gid], has_network)
         if hasattr(self, "network_warning_group"):
             self.network_warning_group.set_visible(not has_network)
         # Re-apply Flatpak-dependent graying when network is available
         if has_network:
             self._refresh_flatpak_dependent()
+        self._last_has_network = has_network
 
     def _build_ui(self):
         """Build the enhanced package selection UI."""
@@ -152,7 +235,7 @@ class PayloadPage(BaseConfigurationPage):
             title="Network required",
             subtitle="Configure network in Network Settings to enable additional software, Flatpak, repositories, and custom packages."
         )
-        warn_icon = Gtk.Image.new_from_icon_name("network-offline-symbolic")
+        warn_icon = Gtk.Image.new_from_gicon(_themed_gicon("network-offline-symbolic"))
         warn_icon.add_css_class("error")
         self.network_warning_row.add_prefix(warn_icon)
         self.network_warning_group.add(self.network_warning_row)
@@ -193,7 +276,7 @@ class PayloadPage(BaseConfigurationPage):
             title="Live Environment Copy",
             subtitle="Copy the entire live system to disk"
         )
-        info_icon = Gtk.Image.new_from_icon_name("object-select-symbolic")
+        info_icon = Gtk.Image.new_from_gicon(_themed_gicon("object-select-symbolic"))
         info_icon.add_css_class("success")
         self.live_copy_info.add_prefix(info_icon)
         self.method_section.add(self.live_copy_info)
@@ -228,26 +311,20 @@ class PayloadPage(BaseConfigurationPage):
             description="Select a web browser to install"
         )
         self.add(self.browser_section)
-        BROWSERS = [
-            ("firefox", "Firefox", "org.mozilla.firefox", "firefox.svg"),
-            ("chrome", "Chrome", "com.google.Chrome", "chrome.svg"),
-            ("brave", "Brave", "com.brave.Browser", "brave.svg"),
-            ("edge", "Edge", "com.microsoft.Edge", "edge.svg"),
-            ("none", "No web browser", None, None),
-        ]
-        self.browser_options = {b[0]: {"name": b[1], "flatpak": b[2], "icon_file": b[3]} for b in BROWSERS}
+        self.browser_options = BROWSER_OPTIONS
         self.selected_browser = "none"
         self.browser_rows = {}
         self.browser_radios = {}
+        self.browser_icons = {}
         first_radio = None
         first_bid = None
         for bid, binfo in self.browser_options.items():
             row = Adw.ActionRow(title=binfo["name"], subtitle="You can always install one later" if bid == "none" else "")
             if binfo["icon_file"]:
-                path = os.path.join(_ICONS_DIR, binfo["icon_file"])
-                icon = Gtk.Image.new_from_file(path) if os.path.isfile(path) else Gtk.Image()
+                icon = Gtk.Image()  # SVG loaded by _ensure_browser_icons on first map
+                self.browser_icons[bid] = icon
             else:
-                icon = Gtk.Image.new_from_icon_name("window-close-symbolic")
+                icon = Gtk.Image.new_from_gicon(_themed_gicon("window-close-symbolic"))
             row.add_prefix(icon)
             radio = Gtk.CheckButton()
             if first_radio is None:
@@ -264,6 +341,7 @@ class PayloadPage(BaseConfigurationPage):
             self.browser_radios[bid] = radio
         if first_bid:
             self.selected_browser = first_bid  # Sync state with default selected radio
+        self.browser_section.connect("map", self._ensure_browser_icons)
 
         # Custom Repositories Section
         self.repos_section = Adw.PreferencesGroup(
@@ -338,6 +416,16 @@ class PayloadPage(BaseConfigurationPage):
         self._refresh_flatpak_dependent()
         self._refresh_server_dependent()
         
+    def _ensure_browser_icons(self, *_args):
+        """Load the browser SVGs the first time the section is actually shown."""
+        if self._browser_icons_loaded:
+            return
+        self._browser_icons_loaded = True
+        for bid, icon in self.browser_icons.items():
+            binfo = self.browser_options[bid]
+            if binfo["icon_file"] in _AVAILABLE_ICONS:
+                icon.set_from_file(binfo["icon_path"])
+
     def _populate_package_groups(self):
         """Populate the package groups section."""
         for group_id, group_info in self.package_groups.items():
@@ -354,7 +442,7 @@ class PayloadPage(BaseConfigurationPage):
             row.set_active(group_info["selected"])
             row.connect("notify::active", self.on_group_toggled, group_id)
             self.additional_section.add(row)
-            
+
     def _populate_repositories(self):
         """Populate the repositories section."""
         for repo_id, repo_info in self.custom_repositories.items():
@@ -365,7 +453,7 @@ class PayloadPage(BaseConfigurationPage):
             row.set_active(repo_info["enabled"])
             row.connect("notify::active", self.on_repo_toggled, repo_id)
             self.repos_section.add(row)
-            
+
     def on_group_toggled(self, switch_row, pspec, group_id):
         """Handle package group toggle."""
         if group_id not in self.package_groups:
@@ -374,148 +462,180 @@ class PayloadPage(BaseConfigurationPage):
         if self.package_groups[group_id]["selected"] == is_active:
             return  # No change, avoid fighting with programmatic set_active
         self.package_groups[group_id]["selected"] = is_active
-        print(f"Package group '{group_id}' {'enabled' if is_active else 'disabled'}")
+        log.debug("Package group '%s' %s", group_id, "enabled" if is_active else "disabled")
             
     def on_repo_toggled(self, switch_row, pspec, repo_id):
         """Handle repository toggle."""
         is_active = switch_row.get_active()
         if repo_id in self.custom_repositories:
             self.custom_repositories[repo_id]["enabled"] = is_active
-            print(f"Repository '{repo_id}' {'enabled' if is_active else 'disabled'}")
+            log.debug("Repository '%s' %s", repo_id, "enabled" if is_active else "disabled")
             
     def _on_browser_selected(self, radio, bid):
+        if self._suppress_browser_handler:
+            return
         if radio.get_active():
             self.selected_browser = bid
-            print(f"Browser selected: {bid}")
+            log.debug("Browser selected: %s", bid)
 
     def _on_install_type_toggled(self, radio, opt_id):
         if radio.get_active():
             self.server_install = opt_id == "server"
             self._refresh_server_dependent()
-            print(f"Installation type: {'Server' if self.server_install else 'Desktop'}")
+            log.debug("Installation type: %s", "Server" if self.server_install else "Desktop")
 
     def _on_nvidia_toggled(self, switch_row, pspec):
         self.nvidia_drivers = switch_row.get_active()
-        print(f"NVIDIA drivers: {'enabled' if self.nvidia_drivers else 'disabled'}")
+        log.debug("NVIDIA drivers: %s", "enabled" if self.nvidia_drivers else "disabled")
 
     def _refresh_server_dependent(self):
         """Gray out bundle and browser options when Server installation is selected."""
+        self._last_has_network = None  # Sensitivities changed; next refresh_for_network re-applies
         desktop = not self.server_install
-        self.additional_section.set_sensitive(desktop)
+        _set_sensitive(self.additional_section, desktop)
         if self.server_install:
             for gid, row in self.package_group_rows.items():
                 if not self.package_groups[gid].get("required"):
                     self.package_groups[gid]["selected"] = False
-                    row.set_active(False)
-            self.selected_browser = "none"
-            for bid, radio in self.browser_radios.items():
-                radio.set_active(bid == "none")
+                    _set_active(row, False)
+            self._reset_browser_selection()
             self.flatpak_enabled = False
-            self.flatpak_row.set_active(False)
-            self.browser_section.set_sensitive(False)
-            self.flatpak_section.set_sensitive(False)
+            self._set_flatpak_row_active(False)
+            _set_sensitive(self.browser_section, False)
+            _set_sensitive(self.flatpak_section, False)
         else:
             # Desktop: restore Flatpak and sensitivities
             self.flatpak_enabled = True
-            self.flatpak_row.set_active(True)
-            self.flatpak_section.set_sensitive(True)
-            self.browser_section.set_sensitive(True)
+            self._set_flatpak_row_active(True)
+            _set_sensitive(self.flatpak_section, True)
+            _set_sensitive(self.browser_section, True)
             self._refresh_flatpak_dependent()
 
+    def _set_flatpak_row_active(self, active):
+        """Flip the Flatpak switch without re-running on_flatpak_toggled."""
+        self._suppress_flatpak_handler = True
+        try:
+            _set_active(self.flatpak_row, active)
+        finally:
+            self._suppress_flatpak_handler = False
+
+    def _reset_browser_selection(self):
+        """Select "No web browser" without a handler run per radio."""
+        self.selected_browser = "none"
+        self._suppress_browser_handler = True
+        try:
+            for bid, radio in self.browser_radios.items():
+                _set_active(radio, bid == "none")
+        finally:
+            self._suppress_browser_handler = False
+
     def _refresh_flatpak_dependent(self):
         """Gray out Flatpak-dependent options when Flatpak is disabled."""
+        self._last_has_network = None  # Sensitivities changed; next refresh_for_network re-applies
         enabled = self.flatpak_enabled and not self.server_install
-        self.browser_section.set_sensitive(enabled)
+        _set_sensitive(self.browser_section, enabled)
         for gid, ginfo in self.package_groups.items():
             if ginfo.get("flatpak_packages") and gid in self.package_group_rows:
                 row = self.package_group_rows[gid]
-                row.set_sensitive(enabled)
+                _set_sensitive(row, enabled)
                 if not enabled:
                     self.package_groups[gid]["selected"] = False
-                    row.set_active(False)
+                    _set_active(row, False)
 
     def on_flatpak_toggled(self, switch_row, pspec):
         """Handle Flatpak toggle."""
+        if self._suppress_flatpak_handler:
+            return
         self.flatpak_enabled = switch_row.get_active()
         self._refresh_flatpak_dependent()
         if not self.flatpak_enabled:
-            self.selected_browser = "none"
-            for bid, radio in self.browser_radios.items():
-                radio.set_active(bid == "none")
-        print(f"Flatpak support {'enabled' if self.flatpak_enabled else 'disabled'}")
+            self._reset_browser_selection()
+        log.debug("Flatpak support %s", "enabled" if self.flatpak_enabled else "disabled")
         
     def on_oem_repo_changed(self, entry_row):
-        """Handle custom repository URL change."""
-        self.oem_repo_url = entry_row.get_text().strip()
-        print(f"Custom repository URL: {self.oem_repo_url}")
-        
+        """Handle custom repository URL change (debounced)."""
+        if self._pending_oem_repo_id:
+            GLib.source_remove(self._pending_oem_repo_id)
+        self._pending_oem_repo_id = GLib.timeout_add(
+            _ENTRY_DEBOUNCE_MS, self._apply_oem_repo_url, entry_row.get_text()
+        )
+
+    def _apply_oem_repo_url(self, text):
+        self._pending_oem_repo_id = 0
+        self.oem_repo_url = text.strip()
+        log.debug("Custom repository URL: %s", self.oem_repo_url)
+        return GLib.SOURCE_REMOVE
+
     def on_custom_packages_changed(self, entry_row):
-        """Handle custom packages list change."""
-        text = entry_row.get_text().strip()
-        self.custom_packages = [pkg.strip() for pkg in text.split() if pkg.strip()]
-        print(f"Custom packages: {self.custom_packages}")
-        
+        """Handle custom packages list change (debounced)."""
+        if self._pending_custom_id:
+            GLib.source_remove(self._pending_custom_id)
+        self._pending_custom_id = GLib.timeout_add(
+            _ENTRY_DEBOUNCE_MS, self._apply_custom_packages, entry_row.get_text()
+        )
+
+    def _apply_custom_packages(self, text):
+        self._pending_custom_id = 0
+        self.custom_packages = text.split()  # split() drops blanks and surrounding whitespace
+        log.debug("Custom packages: %s", self.custom_packages)
+        return GLib.SOURCE_REMOVE
+
+    def _flush_pending_entries(self):
+        """Apply any debounced entry text that has not been parsed yet."""
+        if self._pending_oem_repo_id:
+            GLib.source_remove(self._pending_oem_repo_id)
+            self._apply_oem_repo_url(self.oem_repo_row.get_text())
+        if self._pending_custom_id:
+            GLib.source_remove(self._pending_custom_id)
+            self._apply_custom_packages(self.custom_packages_row.get_text())
+
     def on_minimal_toggled(self, switch_row, pspec):
         """Handle minimal installation toggle."""
         is_minimal = switch_row.get_active()
         
-        # Disable group selections if minimal is enabled
-        for i in range(self.additional_section.get_row_at_index(0) is not None and 10 or 0):
-            row = self.additional_section.get_row_at_index(i)
-            if row and hasattr(row, 'set_sensitive'):
-                # Don't disable required groups
-                group_ids = list(self.package_groups.keys())
-                if i < len(group_ids):
-                    group_id = group_ids[i]
-                    if not self.package_groups[group_id]["required"]:
-                        row.set_sensitive(not is_minimal)
-        
-        print(f"Minimal installation {'enabled' if is_minimal else 'disabled'}")
+        # Disable group selections if minimal is enabled (required groups stay as-is)
+        for group_id, row in self.package_group_rows.items():
+            if not self.package_groups[group_id]["required"]:
+                row.set_sensitive(not is_minimal)
+        self._last_has_network = None  # Sensitivities changed; next refresh_for_network re-applies
+
+        log.debug("Minimal installation %s", "enabled" if is_minimal else "disabled")
         
     def _get_selected_packages(self):
-        """Get the complete list of DNF packages and flatpak packages to install."""
-        dnf_packages = []
-        flatpak_packages = []
-        
-        # Add packages from selected groups (skip bundles when server install)
-        for group_id, group_info in self.package_groups.items():
-            if self.server_install and not group_info.get("required"):
-                continue
-            if group_info["selected"] or group_info["required"]:
-                dnf_packages.extend(group_info.get("packages", []))
-                # Add flatpak packages only when Flatpak enabled and desktop
-                if not self.server_install and self.flatpak_enabled and "flatpak_packages" in group_info:
-                    flatpak_packages.extend(group_info["flatpak_packages"])
-        
+        """Get the DNF packages, flatpak packages and per-group selection to install.
+
+        Returns (dnf_packages, flatpak_packages, group_selection), where
+        group_selection maps each group id to its "selected" flag.
+        """
+        desktop_flatpak = not self.server_install and self.flatpak_enabled
+
+        # Packages from selected groups (skip bundles when server install)
+        group_selection = {}
+        chosen = []
+        for gid, ginfo in self.package_groups.items():
+            group_selection[gid] = ginfo["selected"]
+            if ginfo["required"] or (ginfo["selected"] and not self.server_install):
+                chosen.append(gid)
+        dnf_sources = [_GROUP_DNF.get(gid, ()) for gid in chosen]
+        # Flatpak packages only when Flatpak enabled and desktop
+        flatpak_sources = [_GROUP_FLATPAK.get(gid, ()) for gid in chosen] if desktop_flatpak else []
+
         # Add selected browser (Flatpak only) when Flatpak enabled and desktop
-        if not self.server_install and self.flatpak_enabled and self.selected_browser != "none":
+        if desktop_flatpak and self.selected_browser != "none":
             fp = self.browser_options.get(self.selected_browser, {}).get("flatpak")
             if fp:
-                flatpak_packages.append(fp)
-        
-        # Add custom packages (assume they are DNF packages)
-        dnf_packages.extend(self.custom_packages)
-        
-        # Add OEM packages if any (assume they are DNF packages)
-        dnf_packages.extend(self.oem_packages)
-        
+                flatpak_sources.append((fp,))
+
+        # Custom and OEM packages (assume they are DNF packages)
+        dnf_sources.append(self.custom_packages)
+        dnf_sources.append(self.oem_packages)
+
         # Remove duplicates while preserving order
-        seen = set()
-        unique_dnf_packages = []
-        for pkg in dnf_packages:
-            if pkg not in seen:
-                seen.add(pkg)
-                unique_dnf_packages.append(pkg)
-                
-        seen = set()
-        unique_flatpak_packages = []
-        for pkg in flatpak_packages:
-            if pkg not in seen:
-                seen.add(pkg)
-                unique_flatpak_packages.append(pkg)
-                
-        return unique_dnf_packages, unique_flatpak_packages
-        
+        unique_dnf_packages = list(dict.fromkeys(chain.from_iterable(dnf_sources)))
+        unique_flatpak_packages = list(dict.fromkeys(chain.from_iterable(flatpak_sources)))
+
+        return unique_dnf_packages, unique_flatpak_packages, group_selection
+
     def _get_enabled_repositories(self):
         """Get the list of repositories to enable."""
         enabled_repos = []
@@ -540,7 +660,8 @@ class PayloadPage(BaseConfigurationPage):
         
     def apply_settings_and_return(self, button):
         """Apply the software configuration and return to summary."""
-        print(f"--- Apply Software Settings START ---")
+        log.debug("--- Apply Software Settings START ---")
+        self._flush_pending_entries()
         # Sync selected browser from active radio (handles default Firefox when user never toggled)
         for bid, radio in self.browser_radios.items():
             if radio.get_active():
@@ -548,26 +669,30 @@ class PayloadPage(BaseConfigurationPage):
                 break
         net = self.main_window.final_config.get("network", {}) if self.main_window else {}
         has_network = net.get("network_status") == "connected" and not net.get("skip_network", True)
-        selected_packages, flatpak_packages = self._get_selected_packages()
+        selected_packages, flatpak_packages, group_selection = self._get_selected_packages()
         if not has_network:
             flatpak_packages = []
-            custom_set = set(self.custom_packages) | set(self.oem_packages)
-            selected_packages = [p for p in selected_packages if p not in custom_set]
+            if self.custom_packages or self.oem_packages:
+                custom_set = set(self.custom_packages)
+                custom_set.update(self.oem_packages)
+                selected_packages = [p for p in selected_packages if p not in custom_set]
         enabled_repos = [] if not has_network else self._get_enabled_repositories()
         flatpak_enabled_effective = self.flatpak_enabled and has_network
         
-        print(f"  Selected packages ({len(selected_packages)}): {selected_packages[:10]}{'...' if len(selected_packages) > 10 else ''}")
-        print(f"  Flatpak packages ({len(flatpak_packages)}): {flatpak_packages}")
-        print(f"  Enabled repositories: {[r['id'] for r in enabled_repos]}")
-        print(f"  Flatpak enabled: {self.flatpak_enabled}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("  Selected packages (%d): %s%s", len(selected_packages), selected_packages[:10],
+                      "..." if len(selected_packages) > 10 else "")
+            log.debug("  Flatpak packages (%d): %s", len(flatpak_packages), flatpak_packages)
+            log.debug("  Enabled repositories: %s", [r["id"] for r in enabled_repos])
+            log.debug("  Flatpak enabled: %s", self.flatpak_enabled)
         
         # Add NVIDIA driver packages if enabled
         if self.nvidia_drivers:
-            selected_packages = list(selected_packages) + ["dkms-nvidia", "nvidia-driver", "nvidia-driver-cuda"]
+            selected_packages.extend(("dkms-nvidia", "nvidia-driver", "nvidia-driver-cuda"))
 
         # Build configuration data
         config_values = {
-            "package_groups": {gid: ginfo["selected"] for gid, ginfo in self.package_groups.items()},
+            "package_groups": group_selection,
             "packages": selected_packages,
             "flatpak_packages": flatpak_packages,
             "repositories": enabled_repos,
@@ -596,5 +721,5 @@ class PayloadPage(BaseConfigurationPage):
         total_software = package_count + flatpak_count
         self.show_toast(f"Software plan: {total_software} additional packages ({package_count} DNF, {flatpak_count} Flatpak), {repo_count} repositories{feature_text}")
         
-        print("Software configuration confirmed. Returning to summary.")
+        log.info("Software configuration confirmed. Returning to summary.")
         super().mark_complete_and_return(button, config_values=config_values) 
\ No newline at end of file
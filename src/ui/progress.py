@@ -215,7 +215,7 @@ class ProgressPage(Gtk.Box):
                 except Exception: pass
                 # Check each mount point for active processes using lsof
                 print(f"Running lsof on paths: {list(mount_targets_to_check)} to check for busy resources...")
-                for path in sorted(list(mount_targets_to_check), reverse=True):
+                for path in sorted(mount_targets_to_check, reverse=True):
                     print(f"  Checking lsof on {path}...")
                     lsof_cmd = ["lsof", path]
                     lsof_success, lsof_err, lsof_stdout = backend._run_command(lsof_cmd, f"Check Processes on {path}", timeout=15)
@@ -235,8 +235,8 @@ class ProgressPage(Gtk.Box):
             # --- Attempt Unmount --- 
             unmount_failed = False
             if mount_targets_to_check:
-                print(f"  Attempting to unmount: {sorted(list(mount_targets_to_check))}")
-                for path in sorted(list(mount_targets_to_check), reverse=True):
+                print(f"  Attempting to unmount: {sorted(mount_targets_to_check)}")
+                for path in sorted(mount_targets_to_check, reverse=True):
                     print(f"    Unmounting {path}...")
                     try:
                         try: subprocess.run(["sync"], check=False, timeout=5)
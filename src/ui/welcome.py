@@ -1,8 +1,11 @@
 # centrio_installer/ui/welcome.py
 
 import os
+import re
+import subprocess
 import sys
 import gettext
+from functools import lru_cache
 from pathlib import Path
 
 import gi
@@ -12,13 +15,74 @@ from gi.repository import Gtk, Adw
 
 from utils import get_os_release_info
 
-# Translation function: always bound so no UnboundLocalError
+# Translation function: always bound so no UnboundLocalError. Memoized per msgid;
+# a language change restarts the installer, so the cache never goes stale.
+# English (and C/POSIX) runs have no catalog, so skip the catalog search entirely.
 _locale_dir = Path(__file__).resolve().parents[2] / "locale"
-try:
-    _t = gettext.translation("centrio", localedir=str(_locale_dir), fallback=False)
-    _ = _t.gettext
-except Exception:
+_ui_lang = next(
+    (os.environ[v] for v in ("LANGUAGE", "LC_ALL", "LC_MESSAGES", "LANG") if os.environ.get(v)),
+    "C",
+).split(":")[0]
+if _ui_lang == "en" or _ui_lang.startswith(("en_", "en.", "C", "POSIX")):
     _ = lambda s: s
+else:
+    try:
+        _t = gettext.translation("centrio", localedir=str(_locale_dir), fallback=False)
+        _ = lru_cache(maxsize=512)(_t.gettext)
+    except Exception:
+        _ = lambda s: s
+
+
+# Comprehensive language list with proper codes
+_LANGUAGES = (
+    ("English (US)", "en_US"),
+    ("English (UK)", "en_GB"),
+    ("Español", "es_ES"),
+    ("Français", "fr_FR"),
+    ("Deutsch", "de_DE"),
+    ("Italiano", "it_IT"),
+    ("Português (Brasil)", "pt_BR"),
+    ("Português (Portugal)", "pt_PT"),
+    ("Русский", "ru_RU"),
+    ("中文 (简体)", "zh_CN"),
+    ("中文 (繁體)", "zh_TW"),
+    ("日本語", "ja_JP"),
+    ("한국어", "ko_KR"),
+    ("العربية", "ar_SA"),
+    ("हिन्दी", "hi_IN"),
+    ("ไทย", "th_TH"),
+    ("Türkçe", "tr_TR"),
+    ("Polski", "pl_PL"),
+    ("Nederlands", "nl_NL"),
+    ("Svenska", "sv_SE"),
+    ("Norsk", "no_NO"),
+    ("Dansk", "da_DK"),
+    ("Suomi", "fi_FI"),
+    ("Čeština", "cs_CZ"),
+    ("Slovenčina", "sk_SK"),
+    ("Magyar", "hu_HU"),
+    ("Română", "ro_RO"),
+    ("Български", "bg_BG"),
+    ("Hrvatski", "hr_HR"),
+    ("Slovenščina", "sl_SI"),
+    ("Eesti", "et_EE"),
+    ("Latviešu", "lv_LV"),
+    ("Lietuvių", "lt_LT"),
+    ("Ελληνικά", "el_GR"),
+    ("Català", "ca_ES"),
+    ("Galego", "gl_ES"),
+    ("Euskara", "eu_ES"),
+    ("Gaeilge", "ga_IE"),
+    ("Cymraeg", "cy_GB"),
+)
+_LANG_NAMES = tuple(name for name, _code in _LANGUAGES)
+_LANG_CODES = tuple(code for _name, code in _LANGUAGES)
+_LANG_CODE_INDEX = {code: i for i, code in enumerate(_LANG_CODES)}
+
+# LANG= line in /etc/locale.conf (systemd) or /etc/default/locale (Debian)
+_LOCALE_CONF_FILES = ("/etc/locale.conf", "/etc/default/locale")
+_LOCALE_CONF_LANG_RE = re.compile(rb"^LANG=(\S+)", re.M)
+_LOCALECTL_LANG_RE = re.compile(r"System Locale: LANG=(\S+)")
 
 
 class WelcomePage(Gtk.Box):
@@ -27,6 +91,7 @@ class WelcomePage(Gtk.Box):
         self.main_window = main_window
 
         self.selected_language = "en_US"
+        self._lang_dialog = None  # Built on first language change, then reused
         
         # Get OS Name for branding
         os_info = get_os_release_info()
@@ -69,67 +134,16 @@ class WelcomePage(Gtk.Box):
         # Language selection - more compact
         lang_group = Adw.PreferencesGroup(title=_("Language"))
         self.lang_row = Adw.ComboRow(title=_("Installer Language"))
+        self.language_codes = _LANG_CODES
         
-        # Comprehensive language list with proper codes
-        lang_model = Gtk.StringList()
-        languages = [
-            ("English (US)", "en_US"),
-            ("English (UK)", "en_GB"),
-            ("Español", "es_ES"),
-            ("Français", "fr_FR"),
-            ("Deutsch", "de_DE"),
-            ("Italiano", "it_IT"),
-            ("Português (Brasil)", "pt_BR"),
-            ("Português (Portugal)", "pt_PT"),
-            ("Русский", "ru_RU"),
-            ("中文 (简体)", "zh_CN"),
-            ("中文 (繁體)", "zh_TW"),
-            ("日本語", "ja_JP"),
-            ("한국어", "ko_KR"),
-            ("العربية", "ar_SA"),
-            ("हिन्दी", "hi_IN"),
-            ("ไทย", "th_TH"),
-            ("Türkçe", "tr_TR"),
-            ("Polski", "pl_PL"),
-            ("Nederlands", "nl_NL"),
-            ("Svenska", "sv_SE"),
-            ("Norsk", "no_NO"),
-            ("Dansk", "da_DK"),
-            ("Suomi", "fi_FI"),
-            ("Čeština", "cs_CZ"),
-            ("Slovenčina", "sk_SK"),
-            ("Magyar", "hu_HU"),
-            ("Română", "ro_RO"),
-            ("Български", "bg_BG"),
-            ("Hrvatski", "hr_HR"),
-            ("Slovenščina", "sl_SI"),
-            ("Eesti", "et_EE"),
-            ("Latviešu", "lv_LV"),
-            ("Lietuvių", "lt_LT"),
-            ("Ελληνικά", "el_GR"),
-            ("Català", "ca_ES"),
-            ("Galego", "gl_ES"),
-            ("Euskara", "eu_ES"),
-            ("Gaeilge", "ga_IE"),
-            ("Cymraeg", "cy_GB")
-        ]
-        
-        self.language_codes = [code for _name, code in languages]
-        for name, _code in languages:
-            lang_model.append(name)
+        # One bulk construction instead of an append() round trip per language
+        lang_model = Gtk.StringList.new(_LANG_NAMES)
         
         self.lang_row.set_model(lang_model)
         
-        # Try to detect current system language
+        # Try to detect current system language (default to English)
         current_lang = self._detect_current_language()
-        if current_lang in self.language_codes:
-            try:
-                idx = self.language_codes.index(current_lang)
-                self.lang_row.set_selected(idx)
-            except ValueError:
-                self.lang_row.set_selected(0)  # Default to English
-        else:
-            self.lang_row.set_selected(0)  # Default to English
+        self.lang_row.set_selected(_LANG_CODE_INDEX.get(current_lang, 0))
             
         self.lang_row.connect("notify::selected", self.on_language_changed)
         
@@ -196,41 +210,48 @@ class WelcomePage(Gtk.Box):
             return
 
         # Restart the installer so gettext/locale apply to the whole UI
-        root = self.get_root()
-        dialog = Gtk.MessageDialog(
-            transient_for=root,
-            message_type=Gtk.MessageType.INFO,
-            buttons=Gtk.ButtonsType.OK,
-            text=_("Language Selected"),
-            secondary_text=_("The installer will restart to apply the new language.")
-        )
-        def on_ok(dlg, resp):
-            dlg.destroy()
-            try:
-                os.execv(sys.executable, [sys.executable, script] + sys.argv[1:])
-            except Exception as e:
-                print(f"Could not restart installer: {e}")
-        dialog.connect("response", on_ok)
-        dialog.present()
-    
+        if self._lang_dialog is None:
+            self._lang_dialog = Adw.MessageDialog.new(
+                self.get_root(),
+                _("Language Selected"),
+                _("The installer will restart to apply the new language.")
+            )
+            self._lang_dialog.add_response("ok", _("OK"))
+            self._lang_dialog.set_hide_on_close(True)
+            self._lang_dialog.connect("response", self._on_lang_dialog_response)
+        self._lang_dialog.present()
+
+    def _on_lang_dialog_response(self, dialog, response):
+        script = getattr(self.main_window, "installer_script", None)
+        try:
+            os.execv(sys.executable, [sys.executable, script] + sys.argv[1:])
+        except Exception as e:
+            print(f"Could not restart installer: {e}")
+
     def _detect_current_language(self):
         """Detect the current system language."""
         try:
-            import subprocess
-            import os
-            
             # First try to get from environment
             lang = os.environ.get('LANG', '')
             if lang:
                 # Extract language code (e.g., "en_US.UTF-8" -> "en_US")
                 lang_code = lang.split('.')[0]
                 return lang_code
-            
+
+            # Then the system locale file, before falling back to localectl
+            for conf in _LOCALE_CONF_FILES:
+                try:
+                    with open(conf, "rb") as f:
+                        data = f.read(4096)
+                except OSError:
+                    continue
+                m = _LOCALE_CONF_LANG_RE.search(data)
+                if m:
+                    return m.group(1).decode("utf-8", "replace").strip("\"'").split('.')[0]
+
             result = subprocess.run(["localectl", "status"],
                                     capture_output=True, text=True, check=True)
-            output = result.stdout
-            import re
-            locale_match = re.search(r"System Locale: LANG=(\S+)", output)
+            locale_match = _LOCALECTL_LANG_RE.search(result.stdout)
             if locale_match:
                 lang = locale_match.group(1)
                 return lang.split('.')[0]
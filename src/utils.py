@@ -2,9 +2,11 @@
 
 
 import os
-import platform
 import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 
 # Attempt D-Bus import
 try:
@@ -18,14 +20,18 @@ except ImportError:
     dbus_available = False
     print("WARNING: dasbus library not found. D-Bus communication will be disabled.")
 
+# The enumerations below cannot change during an installer session, so each is
+# computed once and returned as an immutable tuple/mapping shared by all callers.
+
 # --- Timezone Helpers ---
+@lru_cache(maxsize=1)
 def _get_timezone_list():
     """Return full IANA timezone list. Requires zoneinfo (Python 3.9+)."""
     try:
         from zoneinfo import available_timezones
     except ImportError:
         raise RuntimeError("zoneinfo is required for timezones (Python 3.9+).")
-    zones = sorted(available_timezones())
+    zones = tuple(sorted(available_timezones()))
     if not zones:
         raise RuntimeError("zoneinfo.available_timezones() returned no timezones.")
     print(f"  Loaded {len(zones)} timezones from zoneinfo.")
@@ -36,15 +42,17 @@ def ana_get_all_regions_and_timezones():
     """Return full list of IANA timezone identifiers for the timezone selector."""
     return _get_timezone_list()
 
+@lru_cache(maxsize=1)
 def _parse_xkb_layout_descriptions():
     """Parse /usr/share/X11/xkb/rules/evdev.lst for layout code -> human-readable name."""
     desc = {}
     path = "/usr/share/X11/xkb/rules/evdev.lst"
     if not os.path.exists(path):
-        return desc
+        return MappingProxyType(desc)
     try:
         in_layout = False
-        with open(path, "r", encoding="utf-8", errors="replace") as f:
+        # evdev.lst is a few hundred KB; a 64 KiB buffer keeps it to a handful of reads
+        with open(path, "r", buffering=65536, encoding="utf-8", errors="replace") as f:
             for line in f:
                 line = line.rstrip("\n")
                 if line.strip() == "! layout":
@@ -61,34 +69,54 @@ def _parse_xkb_layout_descriptions():
         print(f"  Loaded {len(desc)} keyboard layout descriptions from evdev.lst.")
     except Exception as e:
         print(f"  Could not parse evdev.lst: {e}")
-    return desc
+    return MappingProxyType(desc)
 
 
+@lru_cache(maxsize=1)
 def ana_get_keyboard_layouts():
     """Fetches console keymaps and returns list of (display_name, keymap_code) for UI.
     Display names come from XKB evdev.lst where available; otherwise the code is shown.
     """
     print("Fetching keyboard layouts using localectl...")
-    descriptions = _parse_xkb_layout_descriptions()
+    # Parse evdev.lst on a worker while we wait on localectl; they are independent
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        desc_future = pool.submit(_parse_xkb_layout_descriptions)
+        try:
+            result = subprocess.run(["localectl", "list-keymaps"],
+                                    capture_output=True, text=True, check=True, timeout=15)
+        except FileNotFoundError:
+            raise RuntimeError("localectl is required for keyboard layouts. Install systemd or ensure localectl is in PATH.")
+        except (subprocess.CalledProcessError, Exception) as e:
+            raise RuntimeError(f"localectl list-keymaps failed: {e}") from e
+        descriptions = desc_future.result()
     try:
-        result = subprocess.run(["localectl", "list-keymaps"],
-                                capture_output=True, text=True, check=True, timeout=15)
-        keymaps = sorted([line.strip() for line in result.stdout.split("\n") if line.strip()])
+        keymaps = sorted(filter(None, result.stdout.splitlines()))
         if not keymaps:
             keymaps = ["us"]
-        # Build (display_name, code) list; sort by display name
-        pairs = []
+        # Build (display_name, code) list; sort by display name, lowering each name once
+        decorated = []
         for code in keymaps:
             display = descriptions.get(code, code)
-            pairs.append((display, code))
-        pairs.sort(key=lambda x: x[0].lower())
+            decorated.append((display.lower(), display, code))
+        decorated.sort()
+        pairs = [(display, code) for _key, display, code in decorated]
         print(f"  Found {len(pairs)} keyboard layouts.")
-        return pairs  # List of (display_name, keymap_code)
-    except FileNotFoundError:
-        raise RuntimeError("localectl is required for keyboard layouts. Install systemd or ensure localectl is in PATH.")
-    except (subprocess.CalledProcessError, Exception) as e:
+        return tuple(pairs)  # Tuple of (display_name, keymap_code)
+    except Exception as e:
         raise RuntimeError(f"localectl list-keymaps failed: {e}") from e
 
+def _locale_display_name(locale_code):
+    """Simple conversion for display: en_US.UTF-8 -> En (US).
+
+    This name generation is very basic, ideally use a locale library.
+    """
+    parts = locale_code.split('.')[0].split('_')
+    lang = parts[0]
+    country = f"({parts[1]})" if len(parts) > 1 else ""
+    return f"{lang.capitalize()} {country}".strip()
+
+
+@lru_cache(maxsize=1)
 def ana_get_available_locales():
     """Fetches available locales using localectl."""
     print("Fetching available locales using localectl...")
@@ -96,23 +124,15 @@ def ana_get_available_locales():
     try:
         result = subprocess.run(["localectl", "list-locales"], 
                                 capture_output=True, text=True, check=True)
-        raw_locales = [line.strip() for line in result.stdout.split('\n') if line and '.' in line]
-        # Attempt to generate a display name (basic)
-        for locale_code in raw_locales:
-             # Simple conversion for display: en_US.UTF-8 -> English (US) UTF-8
-             parts = locale_code.split('.')[0].split('_')
-             lang = parts[0]
-             country = f"({parts[1]})" if len(parts) > 1 else ""
-             # This name generation is very basic, ideally use a locale library
-             display_name = f"{lang.capitalize()} {country}".strip()
-             # Use code as key, display name as value (or vice-versa if needed by UI)
-             locales[locale_code] = display_name 
-             
+        raw_locales = [line for line in result.stdout.splitlines() if '.' in line]
+        # Use code as key, display name as value (or vice-versa if needed by UI)
+        locales = {locale_code: _locale_display_name(locale_code) for locale_code in raw_locales}
+
         print(f"  Found {len(locales)} locales.")
         sorted_locales = dict(sorted(locales.items(), key=lambda item: item[1]))
         if not sorted_locales:
             raise RuntimeError("localectl list-locales returned no locales.")
-        return sorted_locales
+        return MappingProxyType(sorted_locales)
 
     except FileNotFoundError:
         raise RuntimeError("localectl is required for locales. Install systemd or ensure localectl is in PATH.") from None
@@ -123,86 +143,96 @@ def ana_get_available_locales():
 
 # Note: Avoid importing GUI or app-specific constants here to keep utils lightweight.
 
+_X86_64_ARCH = {
+    "arch": "x86_64",
+    "efi_suffix": "x64",
+    "efi_shim": "shimx64.efi",
+    "efi_grub": "grubx64.efi",
+    "efi_boot": "BOOTX64.EFI",
+    "grub_efi_pkg": "grub2-efi-x64",
+    "grub_efi_modules_pkg": "grub2-efi-x64-modules",
+    "shim_pkg": "shim-x64",
+    "has_bios": True,
+}
+_AARCH64_ARCH = {
+    "arch": "aarch64",
+    "efi_suffix": "aa64",
+    "efi_shim": "shimaa64.efi",
+    "efi_grub": "grubaa64.efi",
+    "efi_boot": "BOOTAA64.EFI",
+    "grub_efi_pkg": "grub2-efi-aa64",
+    "grub_efi_modules_pkg": "grub2-efi-aa64-modules",
+    "shim_pkg": "shim-aa64",
+    "has_bios": False,
+}
+_ARCH_TABLE = {
+    "x86_64": _X86_64_ARCH,
+    "amd64": _X86_64_ARCH,
+    "aarch64": _AARCH64_ARCH,
+    "arm64": _AARCH64_ARCH,
+}
+
+
+@lru_cache(maxsize=1)
 def get_host_architecture():
     """Return architecture-specific bootloader and package names.
-    Supports x86_64 and aarch64 (ARM64). Returns dict with keys:
+    Supports x86_64 and aarch64 (ARM64). Returns a read-only mapping with keys:
     efi_suffix, efi_shim, efi_grub, efi_boot, grub_efi_pkg, grub_efi_modules_pkg,
     shim_pkg, has_bios (grub2-pc for legacy BIOS; False on ARM64).
     """
-    mach = platform.machine().lower()
-    if mach in ("x86_64", "amd64"):
-        return {
-            "arch": "x86_64",
-            "efi_suffix": "x64",
-            "efi_shim": "shimx64.efi",
-            "efi_grub": "grubx64.efi",
-            "efi_boot": "BOOTX64.EFI",
-            "grub_efi_pkg": "grub2-efi-x64",
-            "grub_efi_modules_pkg": "grub2-efi-x64-modules",
-            "shim_pkg": "shim-x64",
-            "has_bios": True,
-        }
-    if mach in ("aarch64", "arm64"):
-        return {
-            "arch": "aarch64",
-            "efi_suffix": "aa64",
-            "efi_shim": "shimaa64.efi",
-            "efi_grub": "grubaa64.efi",
-            "efi_boot": "BOOTAA64.EFI",
-            "grub_efi_pkg": "grub2-efi-aa64",
-            "grub_efi_modules_pkg": "grub2-efi-aa64-modules",
-            "shim_pkg": "shim-aa64",
-            "has_bios": False,
-        }
-    # Fallback: treat as x86_64 for unknown arch (may fail)
-    print(f"Warning: Unsupported architecture {mach}, defaulting to x86_64 packages")
-    return {
-        "arch": mach,
-        "efi_suffix": "x64",
-        "efi_shim": "shimx64.efi",
-        "efi_grub": "grubx64.efi",
-        "efi_boot": "BOOTX64.EFI",
-        "grub_efi_pkg": "grub2-efi-x64",
-        "grub_efi_modules_pkg": "grub2-efi-x64-modules",
-        "shim_pkg": "shim-x64",
-        "has_bios": True,
-    }
+    mach = os.uname().machine.lower()
+    arch = _ARCH_TABLE.get(mach)
+    if arch is None:
+        # Fallback: treat as x86_64 for unknown arch (may fail)
+        print(f"Warning: Unsupported architecture {mach}, defaulting to x86_64 packages")
+        arch = dict(_X86_64_ARCH, arch=mach)
+    return MappingProxyType(arch)
+
+
+# KEY=value lines of os-release we care about, matched over the whole file at once
+_OS_RELEASE_RE = re.compile(rb"^[ \t]*(NAME|VERSION|VERSION_ID|ID)=(.*)$", re.M)
 
 
 def get_os_release_info(target_root=None):
     """Parses /etc/os-release (or /usr/lib/os-release) to get NAME and VERSION_ID.
     If target_root is provided, reads from within that root.
+    The live system's file cannot change during a session, so that case is read
+    once and callers get a fresh copy; a target root is always re-read since it
+    is still being populated.
     """
+    if not target_root:
+        return dict(_host_os_release_info())
+    return _read_os_release_info(target_root)
+
+
+@lru_cache(maxsize=1)
+def _host_os_release_info():
+    return _read_os_release_info(None)
+
+
+def _read_os_release_info(target_root):
     info = {"NAME": "Linux", "VERSION": None, "VERSION_ID": None, "ID": None} # Defaults
-    release_file_path = None
     base_path = target_root if target_root else "/"
-    
-    # Check standard locations relative to base_path
-    etc_path = os.path.join(base_path, "etc/os-release")
-    usr_lib_path = os.path.join(base_path, "usr/lib/os-release")
-    
-    if os.path.exists(etc_path):
-        release_file_path = etc_path
-    elif os.path.exists(usr_lib_path):
-        release_file_path = usr_lib_path
-    
-    if release_file_path:
+
+    # Try standard locations relative to base_path; open directly instead of stat-ing first
+    for release_file_path in (os.path.join(base_path, "etc/os-release"),
+                              os.path.join(base_path, "usr/lib/os-release")):
         try:
-            with open(release_file_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        # Remove quotes from value if present
-                        value = value.strip('"\'') 
-                        # Store common keys (include VERSION for nicer display)
-                        if key in ["NAME", "VERSION", "VERSION_ID", "ID"]:
-                            info[key] = value
+            with open(release_file_path, 'rb') as f:
+                data = f.read(8192)
+            break
+        except FileNotFoundError:
+            continue
         except Exception as e:
             print(f"Warning: Failed to parse {release_file_path}: {e}")
-            
+            return info
+    else:
+        return info
+
+    # Store common keys (include VERSION for nicer display), quotes removed
+    for m in _OS_RELEASE_RE.finditer(data):
+        info[m.group(1).decode()] = m.group(2).decode("utf-8", "replace").strip().strip('"\'')
+
     return info
 
 # Function to get Anaconda bus address (Modified)
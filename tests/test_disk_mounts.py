@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+pytest.importorskip("gi")
+disk = pytest.importorskip("ui.disk")
+
+# Trimmed `findmnt -J -o SOURCE,TARGET,FSTYPE,OPTIONS` from a live ISO boot
+NESTED_FINDMNT = {
+    "filesystems": [
+        {
+            "source": "/dev/mapper/live-rw", "target": "/", "fstype": "ext4", "options": "rw",
+            "children": [
+                {"source": "proc", "target": "/proc", "fstype": "proc", "options": "rw"},
+                {
+                    "source": "tmpfs", "target": "/run", "fstype": "tmpfs", "options": "rw",
+                    "children": [
+                        {"source": "/dev/sr0", "target": "/run/initramfs/live",
+                         "fstype": "iso9660", "options": "ro"},
+                    ],
+                },
+            ],
+        },
+    ],
+}
+
+
+def test_mounts_from_findmnt_walks_children():
+    mounts = disk._mounts_from_findmnt(NESTED_FINDMNT)
+    assert mounts == {
+        "/": "/dev/mapper/live-rw",
+        "/proc": "proc",
+        "/run": "tmpfs",
+        "/run/initramfs/live": "/dev/sr0",
+    }
+
+
+def test_path_under_child_mount_resolves_to_child_source():
+    mounts = disk._mounts_from_findmnt(NESTED_FINDMNT)
+    assert disk.get_mount_source_for_path("/run/initramfs/live/LiveOS", mounts) == "/dev/sr0"
+    assert disk.get_mount_source_for_path("/proc/self", mounts) == "proc"
+    assert disk.get_mount_source_for_path("/home/liveuser", mounts) == "/dev/mapper/live-rw"
+
+
+def test_overmounted_target_keeps_top_source():
+    data = {"filesystems": [{"source": "/dev/vda1", "target": "/", "children": [
+        {"source": "tmpfs", "target": "/mnt", "children": [
+            {"source": "/dev/vdb1", "target": "/mnt"},
+        ]},
+    ]}]}
+    assert disk._mounts_from_findmnt(data)["/mnt"] == "/dev/vdb1"